@@ -50,11 +50,11 @@ print(result)  # 结构同Celery中的 .to_dict()
 - 支持大规模分布式扩展
 """
 
-import json
 import logging
 from contextlib import asynccontextmanager
 from typing import Any, List, Dict
 
+import orjson
 import ray
 
 from super_rag.tasks.document import document_index_task
@@ -133,7 +133,9 @@ class RayTaskCallbacksMixin:
     def _handle_index_success(self, document_id: str, index_type: str, target_version: int, index_data: dict = None):
         try:
             from super_rag.tasks.reconciler import index_task_callbacks
-            index_data_json = json.dumps(index_data) if index_data else None
+            index_data_json = (
+                orjson.dumps(index_data, option=orjson.OPT_NON_STR_KEYS).decode() if index_data else None
+            )
             index_task_callbacks.on_index_created(document_id, index_type, target_version, index_data_json)
             logger.info(f"Index success callback executed for {index_type} index of document {document_id} (v{target_version})")
         except Exception as e:
@@ -159,12 +161,13 @@ class RayTaskCallbacksMixin:
 raycallbacks = RayTaskCallbacksMixin()
 
 @ray.remote
-def parse_document_task(document_id: str, index_types: List[str]) -> dict:
+def parse_document_task(document_id: str, index_types: List[str]) -> bytes:
     try:
         logger.info(f"Starting to parse document {document_id}")
         parsed_data = document_index_task.parse_document(document_id)
         logger.info(f"Successfully parsed document {document_id}")
-        return parsed_data.to_dict()
+        # One compact msgpack payload, shared by every index task of the fan-out
+        return parsed_data.to_msgpack()
     except Exception as e:
         error_msg = f"Failed to parse document {document_id}: {str(e)}"
         logger.error(error_msg, exc_info=True)
@@ -172,7 +175,7 @@ def parse_document_task(document_id: str, index_types: List[str]) -> dict:
         raise
 
 @ray.remote
-def create_index_task(document_id: str, index_type: str, parsed_data_dict: dict, context: dict = None) -> dict:
+def create_index_task(document_id: str, index_type: str, parsed_data_payload: bytes, context: dict = None) -> dict:
     from super_rag.db.models import DocumentIndexStatus
     context = context or {}
     target_version = context.get(f'{index_type}_version')
@@ -182,7 +185,7 @@ def create_index_task(document_id: str, index_type: str, parsed_data_dict: dict,
         skip_reason = _validate_task_relevance(document_id, index_type, target_version, DocumentIndexStatus.CREATING)
         if skip_reason:
             return skip_reason
-        parsed_data = ParsedDocumentData.from_dict(parsed_data_dict)
+        parsed_data = ParsedDocumentData.from_msgpack(parsed_data_payload)
         result = document_index_task.create_index(document_id, index_type, parsed_data)
 
         if not result.success:
@@ -241,7 +244,7 @@ def delete_index_task(document_id: str, index_type: str) -> dict:
         raise
 
 @ray.remote
-def update_index_task(document_id: str, index_type: str, parsed_data_dict: dict, context: dict = None) -> dict:
+def update_index_task(document_id: str, index_type: str, parsed_data_payload: bytes, context: dict = None) -> dict:
     from super_rag.db.models import DocumentIndexStatus
     context = context or {}
     target_version = context.get(f'{index_type}_version')
@@ -250,7 +253,7 @@ def update_index_task(document_id: str, index_type: str, parsed_data_dict: dict,
         skip_reason = _validate_task_relevance(document_id, index_type, target_version, DocumentIndexStatus.CREATING)
         if skip_reason:
             return skip_reason
-        parsed_data = ParsedDocumentData.from_dict(parsed_data_dict)
+        parsed_data = ParsedDocumentData.from_msgpack(parsed_data_payload)
         result = document_index_task.update_index(document_id, index_type, parsed_data)
         if not result.success:
             error_msg = f"Failed to update {index_type} index for document {document_id}: {result.error}"
@@ -437,7 +440,7 @@ def update_document_indexes_workflow(document_id: str, index_types: List[str], c
 # ========== Dynamic Workflow Orchestration Tasks (Ray implementation) ==========
 
 @ray.remote
-def trigger_create_indexes_workflow(document_id: str, index_types: List[str], context: dict = None, parsed_data_dict: dict = None) -> dict:
+def trigger_create_indexes_workflow(document_id: str, index_types: List[str], context: dict = None, parsed_data_payload: bytes = None) -> dict:
     """
     Dynamic orchestration task for index creation workflow, using Ray.
 
@@ -445,7 +448,7 @@ def trigger_create_indexes_workflow(document_id: str, index_types: List[str], co
         document_id: Document ID to process
         index_types: List of index types to create
         context: Optional context dictionary
-        parsed_data_dict: Serialized ParsedDocumentData (if pre-parsed; can be None)
+        parsed_data_payload: ParsedDocumentData as msgpack bytes (if pre-parsed; can be None)
 
     Returns:
         Dict of aggregated create results.
@@ -453,11 +456,11 @@ def trigger_create_indexes_workflow(document_id: str, index_types: List[str], co
     try:
         logger.info(f"Triggering parallel index creation for document {document_id} with types: {index_types}")
         # If not provided, parse the document
-        if parsed_data_dict is None:
-            parsed_data_dict = ray.get(parse_document_task.remote(document_id, index_types))
+        if parsed_data_payload is None:
+            parsed_data_payload = ray.get(parse_document_task.remote(document_id, index_types))
         # Fan-out: launch multiple create_index_task in parallel by Ray
         create_refs = [
-            create_index_task.remote(document_id, index_type, parsed_data_dict, context)
+            create_index_task.remote(document_id, index_type, parsed_data_payload, context)
             for index_type in index_types
         ]
         # Wait for all tasks
@@ -517,7 +520,7 @@ def trigger_delete_indexes_workflow(document_id: str, index_types: List[str]) ->
         }
 
 @ray.remote
-def trigger_update_indexes_workflow(document_id: str, index_types: List[str], context: dict = None, parsed_data_dict: dict = None) -> dict:
+def trigger_update_indexes_workflow(document_id: str, index_types: List[str], context: dict = None, parsed_data_payload: bytes = None) -> dict:
     """
     Dynamic orchestration task for index update workflow (Ray).
 
@@ -525,7 +528,7 @@ def trigger_update_indexes_workflow(document_id: str, index_types: List[str], co
         document_id: Document ID to process
         index_types: List of index types to update
         context: Optional context
-        parsed_data_dict: Parsed doc data, or None to re-parse.
+        parsed_data_payload: Parsed doc data as msgpack bytes, or None to re-parse.
 
     Returns:
         Aggregated update workflow results.
@@ -533,11 +536,11 @@ def trigger_update_indexes_workflow(document_id: str, index_types: List[str], co
     try:
         logger.info(f"Triggering parallel index update for document {document_id} with types: {index_types}")
         # If not provided, parse the document
-        if parsed_data_dict is None:
-            parsed_data_dict = ray.get(parse_document_task.remote(document_id, index_types))
+        if parsed_data_payload is None:
+            parsed_data_payload = ray.get(parse_document_task.remote(document_id, index_types))
         # Parallel update
         update_refs = [
-            update_index_task.remote(document_id, index_type, parsed_data_dict, context)
+            update_index_task.remote(document_id, index_type, parsed_data_payload, context)
             for index_type in index_types
         ]
         update_results = ray.get(update_refs)
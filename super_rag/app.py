@@ -15,6 +15,7 @@ from super_rag.api.marketplace_collections import router as marketplace_collecti
 from super_rag.api.nodeflow import router as nodeflow_router
 from super_rag.api.web import router as web_router
 from super_rag.api.workflow import router as workflow_router
+from super_rag.llm.rerank.rerank_service import close_shared_client as close_rerank_client
 from super_rag.nodeflow.registry import load_nodeflow_packs
 from super_rag.mcp.server import mcp_server
 
@@ -36,6 +37,8 @@ async def combined_lifespan(app: FastAPI):
         async with agent_session_manager_lifespan(app):
             yield
 
+    await close_rerank_client()
+
 # Explicit name so "lifespan=lifespan" or "lifespan=combined_lifespan" both work
 lifespan = combined_lifespan
 
@@ -1,4 +1,13 @@
+import sys
+import types
+from collections import namedtuple
 
+# Shared refusal clause reused by the RAG answer templates below.
+_NO_HALLUCINATE_ZH = "如果你不知道答案，就直接说你不知道，不要试图编造一个答案。"
+_NO_HALLUCINATE_EN = "If you don't know the answer, just say that you don't know, don't try to make up an answer."
+# The KG/vector mix templates keep their own shorter rule-list wording.
+_KG_NO_HALLUCINATE_ZH = "如果你不知道答案，就直接说明。不要编造信息。"
+_KG_NO_HALLUCINATE_EN = "If you don't know the answer, just say so. Do not make anything up."
 
 CHINESE_PROMPT = """# 角色与核心原则
 1.  **角色定位**: 你是一位顶尖投行的资深金融分析师，精通财报解读，目标是为用户提供清晰、准确、有洞察的回答。
@@ -66,7 +75,8 @@ CHINESE_PROMPT_TEMPLATE = (
     "### 助理："
 )
 
-DEFAULT_ENGLISH_PROMPT_TEMPLATE_V2 = """
+DEFAULT_ENGLISH_PROMPT_TEMPLATE_V2 = (
+    """
 Context information is below. \n
 ---------------------\n
 {context}
@@ -75,12 +85,16 @@ Given the context information, please think step by step and answer the question
 
 Please make sure that the answer is accurate and concise.
 
-If you don't know the answer, just say that you don't know, don't try to make up an answer.
+"""
+    + _NO_HALLUCINATE_EN
+    + """
 
 Don't repeat yourself.
 """
+)
 
-DEFAULT_CHINESE_PROMPT_TEMPLATE_V2 = """
+DEFAULT_CHINESE_PROMPT_TEMPLATE_V2 = (
+    """
 候选答案信息如下
 ----------------
 {context}
@@ -90,10 +104,13 @@ DEFAULT_CHINESE_PROMPT_TEMPLATE_V2 = """
  
 你需要谨慎准确的根据提供的markdown格式的信息，然后回答问题：{query}。
  
-请一步一步思考，请确保回答准确和简洁，如果你不知道答案，就直接说你不知道，不要试图编造一个答案。
+请一步一步思考，请确保回答准确和简洁，"""
+    + _NO_HALLUCINATE_ZH
+    + """
 
 问题只回答一次。
 """
+)
 
 DEFAULT_ENGLISH_PROMPT_TEMPLATE_V3 = """
 You are an expert at answering questions based on dialogue history and provided candidate answer. 
@@ -128,7 +145,8 @@ DEFAULT_CHINESE_PROMPT_TEMPLATE_V3 = """
 --------------------
 """
 
-DEFAULT_KG_VECTOR_MIX_ENGLISH_PROMPT_TEMPLATE = """---Role---
+DEFAULT_KG_VECTOR_MIX_ENGLISH_PROMPT_TEMPLATE = (
+    """---Role---
 
 You are a helpful assistant responding to user query about Data Sources provided below.
 user query is: {query}
@@ -155,10 +173,14 @@ When handling information with timestamps:
 - Organize answer in sections focusing on one main point or aspect of the answer
 - Use clear and descriptive section titles that reflect the content
 - List up to 5 most important reference sources at the end under "References" section. Clearly indicating whether each source is from Knowledge Graph (KG) or Vector Data (DC), and include the file path if available, in the following format: [KG/DC] file_path
-- If you don't know the answer, just say so. Do not make anything up.
+- """
+    + _KG_NO_HALLUCINATE_EN
+    + """
 - Do not include information not provided by the Data Sources."""
+)
 
-DEFAULT_KG_VECTOR_MIX_CHINESE_PROMPT_TEMPLATE = """---角色---
+DEFAULT_KG_VECTOR_MIX_CHINESE_PROMPT_TEMPLATE = (
+    """---角色---
 
 你是一个乐于助人的助手，负责根据下方提供的数据源信息来回答用户的查询。
 用户的查询是: {query}
@@ -185,18 +207,28 @@ DEFAULT_KG_VECTOR_MIX_CHINESE_PROMPT_TEMPLATE = """---角色---
 -   将答案组织成不同章节，每章节聚焦于答案的一个核心要点或方面。
 -   使用清晰且能反映内容的描述性章节标题。
 -   在回答末尾的“参考来源”部分，列出最多 5 个最重要的信息来源。清晰标明每个来源是来自知识图谱 (KG) 还是文档片段 (DC)，如果文件路径可用，请包含它，格式如下：`[KG/DC] 文件路径`
--   如果你不知道答案，就直接说明。不要编造信息。
+-   """
+    + _KG_NO_HALLUCINATE_ZH
+    + """
 -   不要包含数据源中未提供的信息。"""
+)
 
-DEFAULT_MODEL_PROMPT_TEMPLATES = {
-    "vicuna-13b": DEFAULT_ENGLISH_PROMPT_TEMPLATE_V2,
-    "baichuan-13b": DEFAULT_CHINESE_PROMPT_TEMPLATE_V2,
-}
+DEFAULT_MODEL_PROMPT_TEMPLATES = types.MappingProxyType(
+    {
+        sys.intern("vicuna-13b"): DEFAULT_ENGLISH_PROMPT_TEMPLATE_V2,
+        sys.intern("baichuan-13b"): DEFAULT_CHINESE_PROMPT_TEMPLATE_V2,
+    }
+)
 
-DEFAULT_MODEL_MEMOTY_PROMPT_TEMPLATES = {
-    "vicuna-13b": DEFAULT_ENGLISH_PROMPT_TEMPLATE_V3,
-    "baichuan-13b": DEFAULT_CHINESE_PROMPT_TEMPLATE_V3,
-}
+DEFAULT_MODEL_MEMORY_PROMPT_TEMPLATES = types.MappingProxyType(
+    {
+        sys.intern("vicuna-13b"): DEFAULT_ENGLISH_PROMPT_TEMPLATE_V3,
+        sys.intern("baichuan-13b"): DEFAULT_CHINESE_PROMPT_TEMPLATE_V3,
+    }
+)
+
+# Backward-compatible alias for the original (misspelled) name.
+DEFAULT_MODEL_MEMOTY_PROMPT_TEMPLATES = DEFAULT_MODEL_MEMORY_PROMPT_TEMPLATES
 
 QUESTION_EXTRACTION_PROMPT_TEMPLATE = """
 
@@ -295,7 +327,7 @@ COMMON_FILE_TEMPLATE = """
 -----------------------------------
 """
 
-MULTI_ROLE_ZH_PROMPT_TEMPLATES = [
+_RAW_MULTI_ROLE_ZH_PROMPT_TEMPLATES = [
     {"name": "通用机器人", "prompt": """{query}""", "description": "通用机器人"},
     {
         "name": "英文->中文翻译",
@@ -657,7 +689,7 @@ Now please translate the following content into Japanese:
     },
 ]
 
-MULTI_ROLE_EN_PROMPT_TEMPLATES = [
+_RAW_MULTI_ROLE_EN_PROMPT_TEMPLATES = [
     {"name": "universal robot", "prompt": """{query}""", "description": "universal robot"},
     {
         "name": "English->Chinese Translation",
@@ -1018,3 +1050,61 @@ Now please translate the following content into Japanese:
         "description": "Transform ordinary copy into compelling content",
     },
 ]
+
+# Role prompts are listed in a fixed order for the UI; keep them as an
+# immutable tuple of Role records.
+Role = namedtuple("Role", "name prompt description")
+
+
+def _build_roles(raw_templates):
+    return tuple(Role(t["name"], t["prompt"], t["description"]) for t in raw_templates)
+
+
+MULTI_ROLE_ZH_PROMPT_TEMPLATES = _build_roles(_RAW_MULTI_ROLE_ZH_PROMPT_TEMPLATES)
+MULTI_ROLE_EN_PROMPT_TEMPLATES = _build_roles(_RAW_MULTI_ROLE_EN_PROMPT_TEMPLATES)
+del _RAW_MULTI_ROLE_ZH_PROMPT_TEMPLATES, _RAW_MULTI_ROLE_EN_PROMPT_TEMPLATES
+
+# Token budgets (cl100k_base) for the single-string templates above. These
+# templates are sent on every RAG request, so growth here is a per-call cost.
+_TEMPLATE_BUDGETS = {
+    "CHINESE_PROMPT": 1500,
+    "ENGLISH_PROMPT_TEMPLATE": 200,
+    "CHINESE_PROMPT_TEMPLATE": 200,
+    "DEFAULT_ENGLISH_PROMPT_TEMPLATE_V2": 150,
+    "DEFAULT_CHINESE_PROMPT_TEMPLATE_V2": 300,
+    "DEFAULT_ENGLISH_PROMPT_TEMPLATE_V3": 200,
+    "DEFAULT_CHINESE_PROMPT_TEMPLATE_V3": 300,
+    "DEFAULT_KG_VECTOR_MIX_ENGLISH_PROMPT_TEMPLATE": 700,
+    "DEFAULT_KG_VECTOR_MIX_CHINESE_PROMPT_TEMPLATE": 950,
+    "QUESTION_EXTRACTION_PROMPT_TEMPLATE": 200,
+    "QUESTION_EXTRACTION_PROMPT_TEMPLATE_V2": 300,
+    "QUESTION_ANSWERING_PROMPT_TEMPLATE": 200,
+    "CHINESE_QA_EXTRACTION_PROMPT_TEMPLATE": 250,
+    "KEYWORD_PROMPT_TEMPLATE": 200,
+    "COMMON_TEMPLATE": 150,
+    "COMMON_MEMORY_TEMPLATE": 150,
+    "COMMON_FILE_TEMPLATE": 200,
+}
+
+
+def get_template_size_table() -> dict:
+    """Return ``{template_name: (byte_length, token_length)}`` for all budgeted templates."""
+    from super_rag.utils.tokenizer import get_default_tokenizer
+
+    encode = get_default_tokenizer()
+    table = {}
+    for name in _TEMPLATE_BUDGETS:
+        template = globals()[name]
+        table[name] = (len(template.encode("utf-8")), len(encode(template)))
+    return table
+
+
+def check_template_budgets():
+    """Raise ``ValueError`` if any template exceeds its token budget."""
+    over_budget = [
+        f"{name}: {tokens} tokens > {_TEMPLATE_BUDGETS[name]}"
+        for name, (_, tokens) in get_template_size_table().items()
+        if tokens > _TEMPLATE_BUDGETS[name]
+    ]
+    if over_budget:
+        raise ValueError("Prompt templates over budget: " + "; ".join(over_budget))
@@ -1,22 +1,114 @@
 
 
+import asyncio
+import hashlib
 import json
 import logging
-from typing import List
+import weakref
+from collections import OrderedDict
+from operator import itemgetter
+from typing import AsyncIterator, Dict, List, Tuple
 
 import httpx
 import litellm
+import numpy as np
+import orjson
 
 from super_rag.llm.llm_error_types import (
     InvalidDocumentError,
     RerankError,
-    TooManyDocumentsError,
     wrap_litellm_error,
 )
 from super_rag.models import DocumentWithScore
 
 logger = logging.getLogger(__name__)
 
+# Process-wide LRU of rerank results keyed by (provider, api_base, model, query,
+# texts digest). RerankService is created per request, so the cache lives at module
+# level. Lookups and inserts never await, so no lock is needed on the loop.
+_RANK_CACHE_MAXSIZE = 1024
+_rank_cache: "OrderedDict[Tuple[str, str, str, str, bytes], List[int]]" = OrderedDict()
+
+
+def _texts_digest(texts: List[str]) -> bytes:
+    return hashlib.blake2b(b"\x00".join(t.encode("utf-8") for t in texts), digest_size=16).digest()
+
+
+# One keep-alive HTTP/2 client per event loop, shared by every RerankService on
+# that loop, so requests to the same provider host multiplex over one
+# connection. A client can't outlive its loop, so each one is closed when the
+# loop shuts down (asyncio.run does that before closing it, see _client_lifetime).
+_shared_clients: Dict[asyncio.AbstractEventLoop, Tuple[httpx.AsyncClient, AsyncIterator[None]]] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+async def _client_lifetime(client: httpx.AsyncClient) -> AsyncIterator[None]:
+    """
+    Started once per client; the loop tracks running async generators and
+    closes them in shutdown_asyncgens(), which closes the client on its own loop.
+    """
+    try:
+        yield
+    finally:
+        await client.aclose()
+        # The generator references its loop, so the entry must go for the loop to be freed
+        loop = asyncio.get_running_loop()
+        entry = _shared_clients.get(loop)
+        if entry is not None and entry[0] is client:
+            del _shared_clients[loop]
+
+
+async def _get_shared_client() -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    entry = _shared_clients.get(loop)
+    if entry is None or entry[0].is_closed:
+        client = httpx.AsyncClient(
+            timeout=60.0,
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=64, max_connections=128),
+        )
+        lifetime = _client_lifetime(client)
+        await anext(lifetime)
+        # The loop only holds its async generators weakly
+        _shared_clients[loop] = (client, lifetime)
+        return client
+    return entry[0]
+
+
+async def close_shared_client() -> None:
+    """Close the current loop's shared rerank HTTP client; call on application shutdown."""
+    entry = _shared_clients.pop(asyncio.get_running_loop(), None)
+    if entry is not None:
+        await entry[1].aclose()
+
+
+# Responses at least this long are bounds-checked with NumPy instead of a Python loop
+_NUMPY_BOUNDS_CHECK_THRESHOLD = 256
+_get_index = itemgetter("index")
+
+
+def _split_rank_results(items, n: int) -> Tuple[List[Tuple[int, float]], List[int]]:
+    """Split provider results into in-range ``(index, score)`` pairs and out-of-range indices."""
+    if len(items) >= _NUMPY_BOUNDS_CHECK_THRESHOLD:
+        indices = np.fromiter(map(_get_index, items), dtype=np.int64, count=len(items))
+        scores = np.fromiter(
+            (item.get("relevance_score") or 0.0 for item in items), dtype=np.float64, count=len(items)
+        )
+        mask = (indices >= 0) & (indices < n)
+        if mask.all():
+            return list(zip(indices.tolist(), scores.tolist())), []
+        return list(zip(indices[mask].tolist(), scores[mask].tolist())), indices[~mask].tolist()
+
+    valid_pairs = []
+    invalid_indices = []
+    for idx, item in zip(map(_get_index, items), items):
+        if 0 <= idx < n:
+            valid_pairs.append((idx, item.get("relevance_score") or 0.0))
+        else:
+            invalid_indices.append(idx)
+    return valid_pairs, invalid_indices
+
 
 class RerankService:
     def __init__(
@@ -35,6 +127,11 @@ class RerankService:
 
         # Set document limit based on provider
         self.max_documents = 1000
+        # Cap on concurrent provider calls when a large request is chunked
+        self.max_concurrent_chunks = 8
+
+        self._ali_url = "https://dashscope.aliyuncs.com/api/v1/services/rerank/text-rerank/text-rerank"
+        self._ali_headers = {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
 
     async def async_rerank(self, query: str, results: List[DocumentWithScore]) -> List[DocumentWithScore]:
         try:
@@ -46,38 +143,35 @@ class RerankService:
                 logger.info("No documents to rerank, returning empty list")
                 return []
 
-            # Check document count limits
-            if len(results) > self.max_documents:
-                raise TooManyDocumentsError(
-                    document_count=len(results), max_documents=self.max_documents, model_name=self.model
-                )
+            # A single document has only one possible order
+            if len(results) == 1:
+                return list(results) if (getattr(results[0], "text", None) or "").strip() else []
 
-            # Extract texts and validate documents
-            texts = []
-            invalid_indices = []
-            for i, doc in enumerate(results):
-                if not doc or not hasattr(doc, "text") or not doc.text or not doc.text.strip():
-                    invalid_indices.append(i)
-                    texts.append(" ")  # Use placeholder for empty docs
-                else:
-                    texts.append(doc.text)
+            # Extract texts and validate documents; empty docs get a placeholder
+            raw_texts = [getattr(doc, "text", None) or "" for doc in results]
+            stripped = [t.strip() for t in raw_texts]
+            texts = [t if st else " " for t, st in zip(raw_texts, stripped)]
+            invalid_indices = [i for i, st in enumerate(stripped) if not st]
 
             if invalid_indices:
-                logger.warning(f"Found {len(invalid_indices)} invalid documents at indices: {invalid_indices}")
+                logger.warning("Found %d invalid documents at indices: %s", len(invalid_indices), invalid_indices)
                 if len(invalid_indices) == len(results):
                     raise InvalidDocumentError("All documents are empty or invalid", document_count=len(results))
 
             # Call the cached internal method with simple types
             reranked_indices = await self._rank_texts(query, texts)
 
-            # Reconstruct DocumentWithScore objects in the new order
-            reranked_results = [results[i] for i in reranked_indices if 0 <= i < len(results)]
+            # Reconstruct in the new order; _rank_texts only returns in-range indices
+            if len(reranked_indices) > 1:
+                reranked_results = list(itemgetter(*reranked_indices)(results))
+            else:
+                reranked_results = [results[i] for i in reranked_indices]
 
-            logger.info(f"Successfully reranked {len(reranked_results)} documents")
+            logger.info("Successfully reranked %d documents", len(reranked_results))
             return reranked_results
 
-        except (InvalidDocumentError, TooManyDocumentsError, RerankError):
-            # Re-raise our custom rerank errors
+        except RerankError:
+            # Re-raise our custom rerank errors (incl. InvalidDocumentError)
             raise
         except Exception as e:
             logger.error(f"Rerank operation failed: {str(e)}")
@@ -85,109 +179,145 @@ class RerankService:
             raise wrap_litellm_error(e, "rerank", self.rerank_provider, self.model) from e
 
     async def _rank_texts(self, query: str, texts: List[str]) -> List[int]:
+        if not self.caching:
+            return await self._rank_texts_uncached(query, texts)
+
+        key = (self.rerank_provider, self.api_base, self.model, query, _texts_digest(texts))
+        cached = _rank_cache.get(key)
+        if cached is not None:
+            _rank_cache.move_to_end(key)
+            return list(cached)
+
+        indices = await self._rank_texts_uncached(query, texts)
+        _rank_cache[key] = list(indices)
+        if len(_rank_cache) > _RANK_CACHE_MAXSIZE:
+            _rank_cache.popitem(last=False)
+        return indices
+
+    async def _rank_texts_uncached(self, query: str, texts: List[str]) -> List[int]:
+        if len(texts) <= self.max_documents:
+            return [idx for idx, _ in await self._score_texts(query, texts)]
+        return await self._rank_texts_chunked(query, texts)
+
+    async def _rank_texts_chunked(self, query: str, texts: List[str]) -> List[int]:
+        """Rerank more than ``max_documents`` texts by scoring chunks concurrently and merging by score."""
+        chunk_size = self.max_documents
+        semaphore = asyncio.Semaphore(self.max_concurrent_chunks)
+
+        async def score_chunk(chunk: List[str]) -> List[Tuple[int, float]]:
+            async with semaphore:
+                return await self._score_texts(query, chunk)
+
         try:
-            # Handle different providers
-            if self.rerank_provider == "alibabacloud" or "alibabacloud" in self.rerank_provider.lower():
-                # Use Alibaba Cloud DashScope API format
-                resp = await self._call_alibabacloud_rerank_api(query, texts)
-            else:
-                # Use litellm for other providers
-                resp = await litellm.arerank(
-                    custom_llm_provider=self.rerank_provider,
-                    model=self.model,
-                    query=query,
-                    documents=texts,
-                    api_key=self.api_key,
-                    api_base=self.api_base,
-                    return_documents=False,
-                    caching=self.caching,
-                )
+            async with asyncio.TaskGroup() as tg:
+                tasks = [
+                    (start, tg.create_task(score_chunk(texts[start : start + chunk_size])))
+                    for start in range(0, len(texts), chunk_size)
+                ]
+        except ExceptionGroup as eg:
+            # Surface the first failure as-is so callers keep seeing RerankError etc.
+            raise eg.exceptions[0]
+
+        scored = [(start + idx, score) for start, task in tasks for idx, score in task.result()]
+        scored.sort(key=lambda pair: pair[1], reverse=True)
+        logger.info("Reranked %d documents in %d chunks of up to %d", len(texts), len(tasks), chunk_size)
+        return [idx for idx, _ in scored]
+
+    async def _score_texts(self, query: str, texts: List[str]) -> List[Tuple[int, float]]:
+        """Call the provider once and return ``(index, relevance_score)`` pairs in ranked order."""
+        # Handle different providers
+        if self.rerank_provider == "alibabacloud" or "alibabacloud" in self.rerank_provider.lower():
+            # Use Alibaba Cloud DashScope API format
+            resp = await self._call_alibabacloud_rerank_api(query, texts)
+        else:
+            # Use litellm for other providers
+            resp = await litellm.arerank(
+                custom_llm_provider=self.rerank_provider,
+                model=self.model,
+                query=query,
+                documents=texts,
+                api_key=self.api_key,
+                api_base=self.api_base,
+                return_documents=False,
+                caching=self.caching,
+            )
 
-            # Validate response
-            if not resp or "results" not in resp:
-                raise RerankError(
-                    "Invalid response format from rerank API",
-                    {"provider": self.rerank_provider, "model": self.model, "document_count": len(texts)},
-                )
+        # Validate response
+        if not resp or "results" not in resp:
+            raise RerankError(
+                "Invalid response format from rerank API",
+                {"provider": self.rerank_provider, "model": self.model, "document_count": len(texts)},
+            )
+
+        # Extract and bounds-check indices in a single pass
+        try:
+            n = len(texts)
+            valid_pairs, invalid_rerank_indices = _split_rank_results(resp["results"], n)
 
-            # Extract and validate indices
-            try:
-                indices = [item["index"] for item in resp["results"]]
-
-                # Validate indices
-                if len(indices) != len(texts):
-                    logger.warning(f"Rerank returned {len(indices)} indices for {len(texts)} documents")
-
-                # Check for invalid indices
-                invalid_rerank_indices = [idx for idx in indices if idx < 0 or idx >= len(texts)]
-                if invalid_rerank_indices:
-                    raise RerankError(
-                        f"Invalid rerank indices: {invalid_rerank_indices}",
-                        {
-                            "provider": self.rerank_provider,
-                            "model": self.model,
-                            "invalid_indices": invalid_rerank_indices,
-                        },
-                    )
-
-                # Return the valid indices
-                valid_indices = [idx for idx in indices if 0 <= idx < len(texts)]
-                return valid_indices
-
-            except (KeyError, IndexError, TypeError) as e:
+            returned = len(valid_pairs) + len(invalid_rerank_indices)
+            if returned != n:
+                logger.warning("Rerank returned %d indices for %d documents", returned, n)
+
+            if invalid_rerank_indices:
                 raise RerankError(
-                    f"Failed to parse rerank response: {str(e)}",
+                    f"Invalid rerank indices: {invalid_rerank_indices}",
                     {
                         "provider": self.rerank_provider,
                         "model": self.model,
-                        "response_keys": list(resp.keys()) if isinstance(resp, dict) else "non-dict",
+                        "invalid_indices": invalid_rerank_indices,
                     },
-                ) from e
+                )
 
-        except RerankError:
-            # Re-raise our custom rerank errors
-            raise
-        except Exception as e:
-            logger.error(f"Internal rerank operation failed: {str(e)}")
-            # Convert litellm errors to our custom types
-            raise wrap_litellm_error(e, "rerank", self.rerank_provider, self.model) from e
+            return valid_pairs
+
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            raise RerankError(
+                f"Failed to parse rerank response: {str(e)}",
+                {
+                    "provider": self.rerank_provider,
+                    "model": self.model,
+                    "response_keys": list(resp.keys()) if isinstance(resp, dict) else "non-dict",
+                },
+            ) from e
 
     async def _call_alibabacloud_rerank_api(self, query: str, documents: List[str]) -> dict:
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                url = "https://dashscope.aliyuncs.com/api/v1/services/rerank/text-rerank/text-rerank"
-                headers = {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
-
-                payload = {
-                    "model": self.model,
-                    "input": {"query": query, "documents": documents},
-                    "parameters": {"return_documents": False, "top_n": len(documents)},
+            url = self._ali_url
+
+            payload = {
+                "model": self.model,
+                "input": {"query": query, "documents": documents},
+                "parameters": {"return_documents": False, "top_n": len(documents)},
+            }
+
+            logger.debug("Alibaba Cloud rerank API request to %s with %d documents", url, len(documents))
+
+            # orjson encodes the (up to max_documents) text array in C
+            body = orjson.dumps(payload)
+            client = await _get_shared_client()
+            response = await client.post(url, headers=self._ali_headers, content=body)
+            response.raise_for_status()
+
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError, handled below
+            result = orjson.loads(await response.aread())
+
+            if "output" in result and "results" in result["output"]:
+                # Convert to litellm format
+                return {
+                    "results": [
+                        {"index": item.get("index", i), "relevance_score": item.get("relevance_score", 0.0)}
+                        for i, item in enumerate(result["output"]["results"])
+                    ]
                 }
-
-                logger.debug(f"Alibaba Cloud rerank API request to {url} with {len(documents)} documents")
-
-                response = await client.post(url, headers=headers, json=payload)
-                response.raise_for_status()
-
-                result = response.json()
-
-                if "output" in result and "results" in result["output"]:
-                    # Convert to litellm format
-                    return {
-                        "results": [
-                            {"index": item.get("index", i), "relevance_score": item.get("relevance_score", 0.0)}
-                            for i, item in enumerate(result["output"]["results"])
-                        ]
-                    }
-                else:
-                    raise RerankError(
-                        "Unexpected response format from Alibaba Cloud rerank API",
-                        {
-                            "provider": self.rerank_provider,
-                            "model": self.model,
-                            "response_keys": list(result.keys()) if isinstance(result, dict) else "non-dict",
-                        },
-                    )
+            else:
+                raise RerankError(
+                    "Unexpected response format from Alibaba Cloud rerank API",
+                    {
+                        "provider": self.rerank_provider,
+                        "model": self.model,
+                        "response_keys": list(result.keys()) if isinstance(result, dict) else "non-dict",
+                    },
+                )
 
         except httpx.HTTPStatusError as e:
             logger.error(
@@ -0,0 +1,49 @@
+
+import pytest
+
+from super_rag.llm import prompts
+
+
+@pytest.mark.parametrize(
+    "template, clause",
+    [
+        (prompts.DEFAULT_ENGLISH_PROMPT_TEMPLATE_V2, prompts._NO_HALLUCINATE_EN),
+        (prompts.DEFAULT_CHINESE_PROMPT_TEMPLATE_V2, prompts._NO_HALLUCINATE_ZH),
+    ],
+)
+def test_answer_templates_carry_shared_refusal_clause(template, clause):
+    rendered = template.format(query="q", context="c")
+
+    assert rendered.count(clause) == 1
+
+
+def test_kg_vector_mix_templates_keep_their_own_refusal_rule():
+    english = prompts.DEFAULT_KG_VECTOR_MIX_ENGLISH_PROMPT_TEMPLATE.format(query="q", context="c")
+    chinese = prompts.DEFAULT_KG_VECTOR_MIX_CHINESE_PROMPT_TEMPLATE.format(query="q", context="c")
+
+    assert "\n- If you don't know the answer, just say so. Do not make anything up.\n" in english
+    assert "\n-   如果你不知道答案，就直接说明。不要编造信息。\n" in chinese
+    assert prompts._NO_HALLUCINATE_EN not in english
+    assert prompts._NO_HALLUCINATE_ZH not in chinese
+
+
+def test_memory_templates_keep_dialogue_history_refusal():
+    english = prompts.DEFAULT_ENGLISH_PROMPT_TEMPLATE_V3.format(query="q", context="c")
+    chinese = prompts.DEFAULT_CHINESE_PROMPT_TEMPLATE_V3.format(query="q", context="c")
+
+    assert (
+        "If the answer cannot be found in the dialogue history and candidate answer, "
+        "simply state that you do not know. Do not attempt to fabricate an answer."
+    ) in english
+    assert "如果从对话记录和候选答案中找不出回答，就直接说你不知道，不要试图编造一个回答。" in chinese
+
+
+def test_question_answering_template_has_no_refusal_clause():
+    rendered = prompts.QUESTION_ANSWERING_PROMPT_TEMPLATE.format(context="c")
+
+    assert prompts._NO_HALLUCINATE_ZH not in rendered
+    assert "不知道" not in rendered
+
+
+def test_templates_fit_their_token_budgets():
+    prompts.check_template_budgets()
@@ -55,9 +55,11 @@ def do_run_migrations(connection):
 
 async def run_async_migrations_online():
     """Run migrations in 'online' mode using SQLAlchemy async engine."""
+    # A migration run uses a single connection; StaticPool keeps it instead
+    # of reconnecting on every checkout as NullPool does.
     connectable = create_async_engine(
         config.get_main_option("sqlalchemy.url"),
-        poolclass=pool.NullPool,
+        poolclass=pool.StaticPool,
     )
     async with connectable.connect() as connection:
         await connection.run_sync(do_run_migrations)
@@ -72,7 +74,7 @@ def run_migrations_online():
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
-        poolclass=pool.NullPool,
+        poolclass=pool.StaticPool,
     )
     with connectable.connect() as connection:
         do_run_migrations(connection)
@@ -19,24 +19,91 @@ branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
+# (bot index, agent index) pairs renamed together with the table
+_AGENT_INDEX_RENAMES = (
+    ("ix_bot_user", "ix_agent_user"),
+    ("ix_bot_status", "ix_agent_status"),
+    ("ix_bot_gmt_deleted", "ix_agent_gmt_deleted"),
+)
+
+
+def _execute_all(statements: Sequence[str]) -> None:
+    for statement in statements:
+        op.execute(statement)
+
+
+def _upgrade_chat_postgresql(inspector) -> None:
+    """Rename chat.bot_id and its index/constraint in the catalog instead of rebuilding them."""
+    chat_uniques = {uc["name"] for uc in inspector.get_unique_constraints("chat") if uc.get("name")}
+    chat_indexes = {idx["name"] for idx in inspector.get_indexes("chat") if idx.get("name")}
+
+    statements = ['ALTER TABLE chat RENAME COLUMN bot_id TO agent_id']
+    if "ix_chat_bot_id" in chat_indexes:
+        statements.append('ALTER INDEX ix_chat_bot_id RENAME TO ix_chat_agent_id')
+    if "uq_chat_bot_peer_deleted" in chat_uniques:
+        statements.append('ALTER TABLE chat RENAME CONSTRAINT uq_chat_bot_peer_deleted TO uq_chat_agent_peer_deleted')
+    _execute_all(statements)
+
+    if "ix_chat_bot_id" not in chat_indexes:
+        op.create_index("ix_chat_agent_id", "chat", ["agent_id"], unique=False)
+    if "uq_chat_bot_peer_deleted" not in chat_uniques:
+        op.create_unique_constraint(
+            "uq_chat_agent_peer_deleted",
+            "chat",
+            ["agent_id", "peer_type", "peer_id", "gmt_deleted"],
+        )
+
+
+def _downgrade_chat_postgresql(inspector) -> None:
+    chat_uniques = {uc["name"] for uc in inspector.get_unique_constraints("chat") if uc.get("name")}
+    chat_indexes = {idx["name"] for idx in inspector.get_indexes("chat") if idx.get("name")}
+
+    statements = ['ALTER TABLE chat RENAME COLUMN agent_id TO bot_id']
+    if "ix_chat_agent_id" in chat_indexes:
+        statements.append('ALTER INDEX ix_chat_agent_id RENAME TO ix_chat_bot_id')
+    if "uq_chat_agent_peer_deleted" in chat_uniques:
+        statements.append('ALTER TABLE chat RENAME CONSTRAINT uq_chat_agent_peer_deleted TO uq_chat_bot_peer_deleted')
+    _execute_all(statements)
+
+    if "ix_chat_agent_id" not in chat_indexes:
+        op.create_index("ix_chat_bot_id", "chat", ["bot_id"], unique=False)
+    if "uq_chat_agent_peer_deleted" not in chat_uniques:
+        op.create_unique_constraint(
+            "uq_chat_bot_peer_deleted",
+            "chat",
+            ["bot_id", "peer_type", "peer_id", "gmt_deleted"],
+        )
+
+
 def upgrade() -> None:
     """Upgrade schema."""
     bind = op.get_bind()
     inspector = inspect(bind)
+    is_postgresql = bind.dialect.name == "postgresql"
 
     tables = set(inspector.get_table_names())
     if "bot" in tables and "agent" not in tables:
-        op.rename_table("bot", "agent")
-        op.drop_index("ix_bot_user", table_name="agent")
-        op.drop_index("ix_bot_status", table_name="agent")
-        op.drop_index("ix_bot_gmt_deleted", table_name="agent")
-        op.create_index("ix_agent_user", "agent", ["user"], unique=False)
-        op.create_index("ix_agent_status", "agent", ["status"], unique=False)
-        op.create_index("ix_agent_gmt_deleted", "agent", ["gmt_deleted"], unique=False)
+        if is_postgresql:
+            statements = ['ALTER TABLE bot RENAME TO agent']
+            if inspector.get_pk_constraint("bot").get("name") == "bot_pkey":
+                statements.append('ALTER TABLE agent RENAME CONSTRAINT bot_pkey TO agent_pkey')
+            # Index renames only touch the catalog; no index rebuild
+            statements += [f'ALTER INDEX {old} RENAME TO {new}' for old, new in _AGENT_INDEX_RENAMES]
+            _execute_all(statements)
+        else:
+            op.rename_table("bot", "agent")
+            op.drop_index("ix_bot_user", table_name="agent")
+            op.drop_index("ix_bot_status", table_name="agent")
+            op.drop_index("ix_bot_gmt_deleted", table_name="agent")
+            op.create_index("ix_agent_user", "agent", ["user"], unique=False)
+            op.create_index("ix_agent_status", "agent", ["status"], unique=False)
+            op.create_index("ix_agent_gmt_deleted", "agent", ["gmt_deleted"], unique=False)
 
     if "chat" in tables:
         chat_columns = {col["name"] for col in inspector.get_columns("chat")}
-        if "bot_id" in chat_columns and "agent_id" not in chat_columns:
+        if "bot_id" in chat_columns and "agent_id" not in chat_columns and is_postgresql:
+            _upgrade_chat_postgresql(inspector)
+        elif "bot_id" in chat_columns and "agent_id" not in chat_columns:
             chat_uniques = {uc["name"] for uc in inspector.get_unique_constraints("chat") if uc.get("name")}
             if "uq_chat_bot_peer_deleted" in chat_uniques:
                 op.drop_constraint("uq_chat_bot_peer_deleted", "chat", type_="unique")
@@ -61,11 +128,14 @@ def downgrade() -> None:
     """Downgrade schema."""
     bind = op.get_bind()
     inspector = inspect(bind)
+    is_postgresql = bind.dialect.name == "postgresql"
 
     tables = set(inspector.get_table_names())
     if "chat" in tables:
         chat_columns = {col["name"] for col in inspector.get_columns("chat")}
-        if "agent_id" in chat_columns and "bot_id" not in chat_columns:
+        if "agent_id" in chat_columns and "bot_id" not in chat_columns and is_postgresql:
+            _downgrade_chat_postgresql(inspector)
+        elif "agent_id" in chat_columns and "bot_id" not in chat_columns:
             chat_uniques = {uc["name"] for uc in inspector.get_unique_constraints("chat") if uc.get("name")}
             if "uq_chat_agent_peer_deleted" in chat_uniques:
                 op.drop_constraint("uq_chat_agent_peer_deleted", "chat", type_="unique")
@@ -86,10 +156,17 @@ def downgrade() -> None:
             )
 
     if "agent" in tables and "bot" not in tables:
-        op.drop_index("ix_agent_gmt_deleted", table_name="agent")
-        op.drop_index("ix_agent_status", table_name="agent")
-        op.drop_index("ix_agent_user", table_name="agent")
-        op.create_index("ix_bot_user", "agent", ["user"], unique=False)
-        op.create_index("ix_bot_status", "agent", ["status"], unique=False)
-        op.create_index("ix_bot_gmt_deleted", "agent", ["gmt_deleted"], unique=False)
-        op.rename_table("agent", "bot")
+        if is_postgresql:
+            statements = [f'ALTER INDEX {new} RENAME TO {old}' for old, new in _AGENT_INDEX_RENAMES]
+            statements.append('ALTER TABLE agent RENAME TO bot')
+            if inspector.get_pk_constraint("agent").get("name") == "agent_pkey":
+                statements.append('ALTER TABLE bot RENAME CONSTRAINT agent_pkey TO bot_pkey')
+            _execute_all(statements)
+        else:
+            op.drop_index("ix_agent_gmt_deleted", table_name="agent")
+            op.drop_index("ix_agent_status", table_name="agent")
+            op.drop_index("ix_agent_user", table_name="agent")
+            op.create_index("ix_bot_user", "agent", ["user"], unique=False)
+            op.create_index("ix_bot_status", "agent", ["status"], unique=False)
+            op.create_index("ix_bot_gmt_deleted", "agent", ["gmt_deleted"], unique=False)
+            op.rename_table("agent", "bot")
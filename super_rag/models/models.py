@@ -1,7 +1,12 @@
+import base64
 from enum import Enum
-from dataclasses import asdict, dataclass
-from typing import Any, Dict, List, Optional,Literal
-from pydantic import BaseModel
+from types import SimpleNamespace
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional,Literal
+
+import msgpack
+import numpy as np
+from pydantic.main import BaseModel
 
 class TaskStatus(Enum):
     """Task execution status"""
@@ -13,6 +18,50 @@ class TaskStatus(Enum):
     RETRY = "retry"
     PARTIAL_SUCCESS = "partial_success"
 
+
+# Direct lookups for status <-> string conversion, bypassing Enum.value and Enum.__call__
+_TO_DICT_STATUS: Dict[TaskStatus, str] = {status: status.value for status in TaskStatus}
+_FROM_STR: Dict[str, TaskStatus] = {status.value: status for status in TaskStatus}
+
+
+def _pack(payload: Dict[str, Any]) -> bytes:
+    # Values msgpack can't encode are stored as str(), the same rule
+    # _serialize_part_attributes applies to doc part attributes
+    return msgpack.packb(payload, use_bin_type=True, default=str)
+
+
+def _unpack(payload: bytes) -> Dict[str, Any]:
+    # Metadata dicts may have non-str keys (orjson is used with OPT_NON_STR_KEYS elsewhere)
+    return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+
+
+def _fast_from_dict(
+    required: tuple = (),
+    optional: tuple = (),
+    expressions: Optional[Dict[str, str]] = None,
+    namespace: Optional[Dict[str, Any]] = None,
+):
+    """
+    Class decorator that generates a ``from_dict`` classmethod with every field
+    lookup inlined: ``d[name]`` for required fields, ``d.get(name)`` for optional
+    ones, and a source expression over ``d`` for fields needing conversion.
+    Apply it above ``@dataclass(slots=True)``, which replaces the class.
+    """
+
+    def decorator(cls):
+        args = [f"{name}=d[{name!r}]" for name in required]
+        args += [f"{name}=d.get({name!r})" for name in optional]
+        args += [f"{name}={expr}" for name, expr in (expressions or {}).items()]
+        src = f"def from_dict(cls, d):\n    return cls({', '.join(args)})\n"
+        ns = {"_FROM_STR": _FROM_STR, **(namespace or {})}
+        exec(src, ns)
+        from_dict = ns["from_dict"]
+        from_dict.__qualname__ = f"{cls.__qualname__}.from_dict"
+        cls.from_dict = classmethod(from_dict)
+        return cls
+
+    return decorator
+
 class DocumentIndexType(str, Enum):
     """Document index type enumeration"""
 
@@ -21,7 +70,12 @@ class DocumentIndexType(str, Enum):
     SUMMARY = "SUMMARY"
     VISION = "VISION"
 
-@dataclass
+@_fast_from_dict(
+    required=("index_type", "document_id", "success"),
+    optional=("data", "error", "message"),
+    expressions={"status": "_FROM_STR[d['status']]"},
+)
+@dataclass(slots=True)
 class IndexTaskResult:
     """Result of an index operation"""
 
@@ -33,28 +87,13 @@ class IndexTaskResult:
     error: Optional[str] = None
     message: Optional[str] = None
 
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            "status": self.status.value,  # Convert enum to string
-            "index_type": self.index_type,
-            "document_id": self.document_id,
-            "success": self.success,
-            "data": self.data,
-            "error": self.error,
-            "message": self.message,
-        }
+    # Field names used by to_dict (plain class attribute, not a field)
+    _FIELDS = ("status", "index_type", "document_id", "success", "data", "error", "message")
 
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> "IndexTaskResult":
-        return cls(
-            status=TaskStatus(data["status"]),
-            index_type=data["index_type"],
-            document_id=data["document_id"],
-            success=data["success"],
-            data=data.get("data"),
-            error=data.get("error"),
-            message=data.get("message"),
-        )
+    def to_dict(self) -> Dict[str, Any]:
+        result = {name: getattr(self, name) for name in self._FIELDS}
+        result["status"] = _TO_DICT_STATUS[self.status]  # Convert enum to string
+        return result
 
     @classmethod
     def success_result(
@@ -73,7 +112,7 @@ class IndexTaskResult:
     def failed_result(cls, index_type: str, document_id: str, error: str) -> "IndexTaskResult":
         return cls(status=TaskStatus.FAILED, index_type=index_type, document_id=document_id, success=False, error=error)
 
-@dataclass
+@dataclass(slots=True)
 class LocalDocumentInfo:
     """Information about local document file"""
 
@@ -81,9 +120,95 @@ class LocalDocumentInfo:
     is_temp: bool = False
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        # Both fields are primitives, so skip asdict()'s recursive deepcopy
+        return {"path": self.path, "is_temp": self.is_temp}
+
+# Attribute values serialized as-is; anything else goes through str()
+_PRIMITIVE = (str, int, float, bool, list, dict, type(None))
+
+
+def _serialize_part_with_to_dict(part: Any) -> Dict[str, Any]:
+    return part.to_dict()
+
 
-@dataclass
+def _serialize_part_with_model_dump(part: Any) -> Dict[str, Any]:
+    return part.model_dump()
+
+
+def _serialize_part_attributes(part: Any) -> Dict[str, Any]:
+    part_dict = {}
+    for key, value in part.__dict__.items():
+        if isinstance(value, _PRIMITIVE):
+            part_dict[key] = value
+        else:
+            # Convert non-serializable objects to string representation
+            part_dict[key] = str(value)
+    part_dict["_type"] = part.__class__.__name__
+    return part_dict
+
+
+def _serialize_part_as_string(part: Any) -> Dict[str, Any]:
+    return {"content": str(part), "_type": part.__class__.__name__}
+
+
+def _compile_part_serializer(part: Any) -> Callable[[Any], Dict[str, Any]]:
+    """
+    Generate a serializer for the attribute layout of ``part`` that reads each
+    attribute straight from ``__dict__`` instead of walking it. Instances of the
+    same type with different attribute names (or order) fall back to the generic
+    attribute walk.
+    """
+    names = tuple(part.__dict__)
+    items = "".join(
+        f"{name!r}: (v if isinstance(v := d[{name!r}], _primitive) else str(v)), " for name in names
+    )
+    src = (
+        "def serialize(p):\n"
+        "    d = p.__dict__\n"
+        "    if tuple(d) != _names:\n"
+        "        return _fallback(p)\n"
+        f"    return {{{items}'_type': {part.__class__.__name__!r}}}\n"
+    )
+    namespace = {
+        "_primitive": _PRIMITIVE,
+        "_fallback": _serialize_part_attributes,
+        "_names": names,
+    }
+    exec(src, namespace)
+    return namespace["serialize"]
+
+
+# Serializer chosen for each doc part type, so the hasattr probing runs once per type
+_DOC_PART_SERIALIZERS: Dict[type, Callable[[Any], Dict[str, Any]]] = {}
+
+
+def _resolve_doc_part_serializer(part: Any) -> Callable[[Any], Dict[str, Any]]:
+    if hasattr(part, "to_dict"):
+        # If the part has a to_dict method, use it
+        serializer = _serialize_part_with_to_dict
+    elif hasattr(part, "model_dump"):
+        # If the part has a model_dump() method (pydantic), use it
+        serializer = _serialize_part_with_model_dump
+    elif hasattr(part, "__dict__"):
+        # If it's an object with attributes, convert to dict
+        serializer = _compile_part_serializer(part)
+    else:
+        # Fallback: convert to string
+        serializer = _serialize_part_as_string
+    _DOC_PART_SERIALIZERS[type(part)] = serializer
+    return serializer
+
+
+@_fast_from_dict(
+    required=("document_id", "collection_id", "content", "file_path"),
+    expressions={
+        # Deserialize doc_parts to restore object-like behavior
+        "doc_parts": "cls._deserialize_doc_parts(d['doc_parts'])",
+        "local_doc_info": "LocalDocumentInfo(**d['local_doc_info'])",
+    },
+    namespace={"LocalDocumentInfo": LocalDocumentInfo},
+)
+@dataclass(slots=True)
 class ParsedDocumentData:
     """Structured data from document parsing"""
 
@@ -94,67 +219,39 @@ class ParsedDocumentData:
     file_path: str
     local_doc_info: LocalDocumentInfo
 
+    _FIELDS = ("document_id", "collection_id", "content", "doc_parts", "file_path", "local_doc_info")
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dict with proper serialization of doc_parts"""
-        return {
-            "document_id": self.document_id,
-            "collection_id": self.collection_id,
-            "content": self.content,
-            "doc_parts": self._serialize_doc_parts(self.doc_parts),
-            "file_path": self.file_path,
-            "local_doc_info": self.local_doc_info.to_dict(),
-        }
+        result = {name: getattr(self, name) for name in self._FIELDS}
+        result["doc_parts"] = self._serialize_doc_parts(self.doc_parts)
+        result["local_doc_info"] = self.local_doc_info.to_dict()
+        return result
 
     def _serialize_doc_parts(self, doc_parts: List[Any]) -> List[Dict[str, Any]]:
         """Serialize doc_parts to JSON-compatible format"""
+        serializers = _DOC_PART_SERIALIZERS
         serialized_parts = []
         for part in doc_parts:
-            if hasattr(part, "to_dict"):
-                # If the part has a to_dict method, use it
-                serialized_parts.append(part.to_dict())
-            elif hasattr(part, "model_dump"):
-                # If the part has a model_dump() method (pydantic), use it
-                serialized_parts.append(part.model_dump())
-            elif hasattr(part, "__dict__"):
-                # If it's an object with attributes, convert to dict
-                part_dict = {}
-                for key, value in part.__dict__.items():
-                    if isinstance(value, (str, int, float, bool, list, dict, type(None))):
-                        part_dict[key] = value
-                    else:
-                        # Convert non-serializable objects to string representation
-                        part_dict[key] = str(value)
-                part_dict["_type"] = part.__class__.__name__
-                serialized_parts.append(part_dict)
-            else:
-                # Fallback: convert to string
-                serialized_parts.append({"content": str(part), "_type": part.__class__.__name__})
+            serializer = serializers.get(type(part))
+            if serializer is None:
+                serializer = _resolve_doc_part_serializer(part)
+            serialized_parts.append(serializer(part))
         return serialized_parts
 
-    def _deserialize_doc_parts(self, serialized_parts: List[Dict[str, Any]]) -> List[Any]:
+    @staticmethod
+    def _deserialize_doc_parts(serialized_parts: List[Dict[str, Any]]) -> List[Any]:
         """Deserialize doc_parts from JSON format"""
-        # Create simple wrapper objects that mimic the original part behavior
-        deserialized_parts = []
-        for part_dict in serialized_parts:
-            # Create a simple object with attributes from the dict
-            part_obj = type("DocumentPart", (), part_dict)()
-            deserialized_parts.append(part_obj)
-        return deserialized_parts
+        # Simple attribute-access wrappers that mimic the original part behavior;
+        # SimpleNamespace avoids creating a new class per part
+        return [SimpleNamespace(**part_dict) for part_dict in serialized_parts]
+
+    def to_msgpack(self) -> bytes:
+        return _pack(self.to_dict())
 
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> "ParsedDocumentData":
-        local_doc_info = LocalDocumentInfo(**data["local_doc_info"])
-        instance = cls(
-            document_id=data["document_id"],
-            collection_id=data["collection_id"],
-            content=data["content"],
-            doc_parts=[],  # Will be set below
-            file_path=data["file_path"],
-            local_doc_info=local_doc_info,
-        )
-        # Deserialize doc_parts to restore object-like behavior
-        instance.doc_parts = instance._deserialize_doc_parts(data["doc_parts"])
-        return instance
+    def from_msgpack(cls, payload: bytes) -> "ParsedDocumentData":
+        return cls.from_dict(_unpack(payload))
 
 class TaskResult:
     """Standardized task result format"""
@@ -170,7 +267,28 @@ class TaskResult:
     def to_dict(self) -> Dict[str, Any]:
         return {"success": self.success, "data": self.data, "error": self.error, "metadata": self.metadata}
 
-@dataclass
+
+# Unbound method, so WorkflowResult.to_dict can map it over index results
+_index_result_to_dict = IndexTaskResult.to_dict
+
+
+@_fast_from_dict(
+    required=(
+        "workflow_id",
+        "document_id",
+        "operation",
+        "message",
+        "successful_indexes",
+        "failed_indexes",
+        "total_indexes",
+    ),
+    expressions={
+        "status": "_FROM_STR[d['status']]",
+        "index_results": "list(map(_index_result_from_dict, d['index_results']))",
+    },
+    namespace={"_index_result_from_dict": IndexTaskResult.from_dict},
+)
+@dataclass(slots=True)
 class WorkflowResult:
     """Result of a workflow execution"""
 
@@ -189,28 +307,14 @@ class WorkflowResult:
             "workflow_id": self.workflow_id,
             "document_id": self.document_id,
             "operation": self.operation,
-            "status": self.status.value,
+            "status": _TO_DICT_STATUS[self.status],
             "message": self.message,
             "successful_indexes": self.successful_indexes,
             "failed_indexes": self.failed_indexes,
             "total_indexes": self.total_indexes,
-            "index_results": [r.to_dict() for r in self.index_results],
+            "index_results": list(map(_index_result_to_dict, self.index_results)),
         }
 
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> "WorkflowResult":
-        return cls(
-            workflow_id=data["workflow_id"],
-            document_id=data["document_id"],
-            operation=data["operation"],
-            status=TaskStatus(data["status"]),
-            message=data["message"],
-            successful_indexes=data["successful_indexes"],
-            failed_indexes=data["failed_indexes"],
-            total_indexes=data["total_indexes"],
-            index_results=[IndexTaskResult.from_dict(r) for r in data["index_results"]],
-        )
-
     @property
     def all_successful(self) -> bool:
         return len(self.failed_indexes) == 0
@@ -228,6 +332,9 @@ class TextNode:
         metadata (Dict[str, Any]): 节点相关的元数据信息。
         embedding (Optional[List[float]]): 节点的嵌入向量。
     """
+
+    __slots__ = ("text", "metadata", "embedding")
+
     def __init__(
         self,
         text: str,
@@ -238,8 +345,21 @@ class TextNode:
         self.metadata = metadata or {}
         self.embedding = embedding
 
-    def to_dict(self) -> Dict[str, Any]:
-        """将TextNode对象序列化为字典。"""
+    def to_dict(self, quantize: bool = False) -> Dict[str, Any]:
+        """
+        将TextNode对象序列化为字典。
+
+        quantize为True时，嵌入向量以base64编码的float16字节存储（体积约为原来的1/4，
+        有精度损失），并通过"_dtype"字段标记，from_dict会自动还原。
+        """
+        if quantize and self.embedding is not None:
+            embedding = np.asarray(self.embedding, dtype=np.float16).tobytes()
+            return {
+                "text": self.text,
+                "metadata": self.metadata,
+                "embedding": base64.b64encode(embedding).decode("ascii"),
+                "_dtype": "float16",
+            }
         return {
             "text": self.text,
             "metadata": self.metadata,
@@ -249,12 +369,19 @@ class TextNode:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "TextNode":
         """从字典反序列化为TextNode对象。"""
+        embedding = data.get("embedding")
+        if embedding is not None and data.get("_dtype") == "float16":
+            embedding = _dequantize_embedding(base64.b64decode(embedding), np.float16)
         return cls(
             text=data.get("text", ""),
             metadata=data.get("metadata", {}),
-            embedding=data.get("embedding")
+            embedding=embedding
         )
 
+
+def _dequantize_embedding(buffer: bytes, dtype: Any) -> List[float]:
+    return np.frombuffer(buffer, dtype=dtype).astype(np.float32).tolist()
+
 class APIType(str, Enum):
     COMPLETION = "completion"
     EMBEDDING = "embedding"
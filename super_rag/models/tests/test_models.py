@@ -0,0 +1,186 @@
+
+from super_rag.models.models import (
+    IndexTaskResult,
+    LocalDocumentInfo,
+    ParsedDocumentData,
+    TaskStatus,
+    WorkflowResult,
+)
+
+
+class PagePart:
+    def __init__(self, content, metadata):
+        self.content = content
+        self.metadata = metadata
+
+
+def test_parsed_document_msgpack_round_trip_with_non_str_keys():
+    """Parser metadata keyed by ints survives the msgpack payload sent to index tasks"""
+    parsed = ParsedDocumentData(
+        document_id="doc",
+        collection_id="col",
+        content="hello",
+        doc_parts=[PagePart("p1", {1: "first", "page_idx": 0, 2.5: [1, 2]})],
+        file_path="/tmp/doc.md",
+        local_doc_info=LocalDocumentInfo(path="/tmp/doc.md", is_temp=True),
+    )
+
+    restored = ParsedDocumentData.from_msgpack(parsed.to_msgpack())
+
+    assert restored.document_id == "doc"
+    assert restored.collection_id == "col"
+    assert restored.content == "hello"
+    assert restored.local_doc_info == LocalDocumentInfo(path="/tmp/doc.md", is_temp=True)
+    [part] = restored.doc_parts
+    assert part.content == "p1"
+    assert part.metadata == {1: "first", "page_idx": 0, 2.5: [1, 2]}
+    assert part._type == "PagePart"
+
+
+def test_doc_part_with_keyword_attribute_serializes():
+    class FigurePart:
+        pass
+
+    part = FigurePart()
+    part.content = "p1"
+    setattr(part, "class", "figure")
+    parsed = ParsedDocumentData(
+        document_id="doc",
+        collection_id="col",
+        content="",
+        doc_parts=[part],
+        file_path="/tmp/doc.md",
+        local_doc_info=LocalDocumentInfo(path="/tmp/doc.md"),
+    )
+
+    [serialized] = parsed.to_dict()["doc_parts"]
+
+    assert serialized == {"content": "p1", "class": "figure", "_type": "FigurePart"}
+
+
+def test_doc_part_with_different_attribute_names_falls_back():
+    """Same attribute count, different names: must not read class attributes through the fast path"""
+
+    class LabeledPart:
+        label = "class-level"
+
+    first = LabeledPart()
+    first.content = "p1"
+    first.label = "title"
+    second = LabeledPart()
+    second.content = "p2"
+    second.caption = "figure"
+    parsed = ParsedDocumentData(
+        document_id="doc",
+        collection_id="col",
+        content="",
+        doc_parts=[first, second],
+        file_path="/tmp/doc.md",
+        local_doc_info=LocalDocumentInfo(path="/tmp/doc.md"),
+    )
+
+    serialized = parsed.to_dict()["doc_parts"]
+
+    assert serialized == [
+        {"content": "p1", "label": "title", "_type": "LabeledPart"},
+        {"content": "p2", "caption": "figure", "_type": "LabeledPart"},
+    ]
+
+
+# The hand-written from_dict implementations that _fast_from_dict replaced
+def _legacy_index_result_from_dict(data):
+    return IndexTaskResult(
+        status=TaskStatus(data["status"]),
+        **{name: data[name] for name in ("index_type", "document_id", "success")},
+        **{name: data.get(name) for name in ("data", "error", "message")},
+    )
+
+
+def _legacy_workflow_result_from_dict(data):
+    plain_fields = (
+        "workflow_id",
+        "document_id",
+        "operation",
+        "message",
+        "successful_indexes",
+        "failed_indexes",
+        "total_indexes",
+    )
+    return WorkflowResult(
+        status=TaskStatus(data["status"]),
+        index_results=[_legacy_index_result_from_dict(r) for r in data["index_results"]],
+        **{name: data[name] for name in plain_fields},
+    )
+
+
+def _legacy_parsed_document_from_dict(data):
+    return ParsedDocumentData(
+        doc_parts=ParsedDocumentData._deserialize_doc_parts(data["doc_parts"]),
+        local_doc_info=LocalDocumentInfo(**data["local_doc_info"]),
+        **{name: data[name] for name in ("document_id", "collection_id", "content", "file_path")},
+    )
+
+
+def test_index_task_result_from_dict_missing_optionals_and_extra_keys():
+    data = {
+        "status": "success",
+        "index_type": "VECTOR_AND_FULLTEXT",
+        "document_id": "doc",
+        "success": True,
+        "worker": "ray-1",
+    }
+
+    result = IndexTaskResult.from_dict(data)
+
+    assert result == _legacy_index_result_from_dict(data)
+    assert result.status is TaskStatus.SUCCESS
+    assert (result.data, result.error, result.message) == (None, None, None)
+
+
+def test_index_task_result_round_trip():
+    result = IndexTaskResult.failed_result("GRAPH", "doc", "boom")
+
+    assert IndexTaskResult.from_dict(result.to_dict()) == result
+
+
+def test_workflow_result_from_dict_matches_legacy():
+    data = WorkflowResult(
+        workflow_id="wf",
+        document_id="doc",
+        operation="create",
+        status=TaskStatus.FAILED,
+        message="1 of 2 failed",
+        successful_indexes=["VECTOR_AND_FULLTEXT"],
+        failed_indexes=["GRAPH"],
+        total_indexes=2,
+        index_results=[
+            IndexTaskResult.success_result("VECTOR_AND_FULLTEXT", "doc", data={"chunks": 3}),
+            IndexTaskResult.failed_result("GRAPH", "doc", "boom"),
+        ],
+    ).to_dict()
+    data["index_results"][1].pop("message")
+    data["index_results"][0]["extra"] = 1
+    data["extra"] = "ignored"
+
+    result = WorkflowResult.from_dict(data)
+
+    assert result == _legacy_workflow_result_from_dict(data)
+    assert result.index_results[1].message is None
+
+
+def test_parsed_document_from_dict_matches_legacy():
+    parsed = ParsedDocumentData(
+        document_id="doc",
+        collection_id="col",
+        content="hello",
+        doc_parts=[PagePart("p1", {"page_idx": 0})],
+        file_path="/tmp/doc.md",
+        local_doc_info=LocalDocumentInfo(path="/tmp/doc.md", is_temp=True),
+    )
+    data = parsed.to_dict()
+    data["extra"] = "ignored"
+
+    result = ParsedDocumentData.from_dict(data)
+
+    assert result == _legacy_parsed_document_from_dict(data)
+    assert result.doc_parts[0].metadata == {"page_idx": 0}
@@ -1,9 +1,18 @@
 import asyncio
-import copy
 import time
 import warnings
+from contextvars import ContextVar
 from typing import Any, Dict, Hashable, Iterable, List, Optional
 
+# Params of the flow run currently driving the nodes. Flows set this once per
+# traversal instead of copying each node to give it its own params; every
+# asyncio task works on its own context copy, so parallel runs don't alias.
+_RUN_PARAMS: ContextVar[Optional[Dict[str, Any]]] = ContextVar("flow_run_params", default=None)
+
+# Attempt index of the exec currently running. Nodes are shared between parallel
+# runs, so it can't live on the instance; hooks read it through `Node.cur_retry`.
+_CUR_RETRY: ContextVar[int] = ContextVar("flow_cur_retry", default=0)
+
 
 class BaseNode:
     """
@@ -15,14 +24,27 @@ class BaseNode:
     - post(shared, prep_res, exec_res) -> action (used for routing)
     """
 
+    # Class-level flag so flows can dispatch without an isinstance check per hop
+    _async_node = False
+
     def __init__(self) -> None:
-        self.params: Dict[str, Any] = {}
+        self._params: Dict[str, Any] = {}
         # Mapping: action -> successor node
         self.successors: Dict[Hashable, "BaseNode"] = {}
 
     # ----- configuration -----
+    @property
+    def params(self) -> Dict[str, Any]:
+        # Inside a flow run, nodes see the run's params; standalone, their own
+        run_params = _RUN_PARAMS.get()
+        return self._params if run_params is None else run_params
+
+    @params.setter
+    def params(self, params: Dict[str, Any]) -> None:
+        self._params = params
+
     def set_params(self, params: Dict[str, Any]) -> None:
-        self.params = params
+        self._params = params
 
     def next(self, node: "BaseNode", action: Hashable = "default") -> "BaseNode":
         if action in self.successors:
@@ -94,17 +116,21 @@ class Node(BaseNode):
         super().__init__()
         self.max_retries = max_retries
         self.wait = wait
-        self.cur_retry: int = 0
+
+    @property
+    def cur_retry(self) -> int:
+        return _CUR_RETRY.get()
 
     def exec_fallback(self, prep_res: Any, exc: Exception) -> Any:  # pragma: no cover - override when needed
         raise exc
 
     def _exec(self, prep_res: Any) -> Any:
-        for self.cur_retry in range(self.max_retries):
+        for retry in range(self.max_retries):
+            _CUR_RETRY.set(retry)
             try:
                 return self.exec(prep_res)
             except Exception as e:  # pragma: no cover - behaviour depends on subclass
-                if self.cur_retry == self.max_retries - 1:
+                if retry == self.max_retries - 1:
                     return self.exec_fallback(prep_res, e)
                 if self.wait > 0:
                     time.sleep(self.wait)
@@ -113,10 +139,16 @@ class Node(BaseNode):
 class BatchNode(Node):
     """
     Node that processes a batch of independent items sequentially.
+
+    Subclasses that can handle the whole batch in one call (e.g. a single
+    `model.encode(texts)`) may define `vectorized_exec(items) -> list`; it is
+    then called once with all items instead of `exec` per item (no retries).
     """
 
     def _exec(self, items: Optional[Iterable[Any]]) -> List[Any]:
         items = list(items or [])
+        if hasattr(self, "vectorized_exec"):
+            return list(self.vectorized_exec(items))
         return [super(BatchNode, self)._exec(item) for item in items]
 
 
@@ -155,15 +187,16 @@ class Flow(BaseNode):
         if self.start_node is None:
             raise RuntimeError("Flow has no start node configured")
 
-        current: Optional[BaseNode] = copy.copy(self.start_node)
-        p: Dict[str, Any] = params or {**self.params}
+        current: Optional[BaseNode] = self.start_node
+        token = _RUN_PARAMS.set(params or {**self.params})
         last_action: Hashable = None
 
-        while current is not None:
-            current.set_params(p)
-            last_action = current._run(shared)
-            next_node = self.get_next_node(current, last_action)
-            current = copy.copy(next_node) if next_node is not None else None
+        try:
+            while current is not None:
+                last_action = current._run(shared)
+                current = self.get_next_node(current, last_action)
+        finally:
+            _RUN_PARAMS.reset(token)
 
         return last_action
 
@@ -195,6 +228,8 @@ class AsyncNode(Node):
     Override the *_async methods to implement async behaviour.
     """
 
+    _async_node = True
+
     async def prep_async(self, shared: Dict[str, Any]) -> Any:  # pragma: no cover - framework default
         return None
 
@@ -208,11 +243,12 @@ class AsyncNode(Node):
         return "default"
 
     async def _exec(self, prep_res: Any) -> Any:  # type: ignore[override]
-        for self.cur_retry in range(self.max_retries):
+        for retry in range(self.max_retries):
+            _CUR_RETRY.set(retry)
             try:
                 return await self.exec_async(prep_res)
             except Exception as e:  # pragma: no cover - behaviour depends on subclass
-                if self.cur_retry == self.max_retries - 1:
+                if retry == self.max_retries - 1:
                     return await self.exec_fallback_async(prep_res, e)
                 if self.wait > 0:
                     await asyncio.sleep(self.wait)
@@ -235,8 +271,15 @@ class AsyncNode(Node):
 
 
 class AsyncBatchNode(AsyncNode, BatchNode):
+    """
+    Async batch node; define `vectorized_exec_async(items) -> list` to process
+    the whole batch in one awaited call.
+    """
+
     async def _exec(self, items: Optional[Iterable[Any]]) -> List[Any]:  # type: ignore[override]
         items = list(items or [])
+        if hasattr(self, "vectorized_exec_async"):
+            return list(await self.vectorized_exec_async(items))
         results: List[Any] = []
         for item in items:
             results.append(await super(AsyncBatchNode, self)._exec(item))
@@ -246,6 +289,8 @@ class AsyncBatchNode(AsyncNode, BatchNode):
 class AsyncParallelBatchNode(AsyncNode, BatchNode):
     async def _exec(self, items: Optional[Iterable[Any]]) -> List[Any]:  # type: ignore[override]
         items = list(items or [])
+        if hasattr(self, "vectorized_exec_async"):
+            return list(await self.vectorized_exec_async(items))
         return await asyncio.gather(*(super(AsyncParallelBatchNode, self)._exec(item) for item in items))
 
 
@@ -259,18 +304,19 @@ class AsyncFlow(Flow, AsyncNode):
         if self.start_node is None:
             raise RuntimeError("Flow has no start node configured")
 
-        current: Optional[BaseNode] = copy.copy(self.start_node)
-        p: Dict[str, Any] = params or {**self.params}
+        current: Optional[BaseNode] = self.start_node
+        token = _RUN_PARAMS.set(params or {**self.params})
         last_action: Hashable = None
 
-        while current is not None:
-            current.set_params(p)
-            if isinstance(current, AsyncNode):
-                last_action = await current._run_async(shared)
-            else:
-                last_action = current._run(shared)
-            next_node = self.get_next_node(current, last_action)
-            current = copy.copy(next_node) if next_node is not None else None
+        try:
+            while current is not None:
+                if current._async_node:
+                    last_action = await current._run_async(shared)
+                else:
+                    last_action = current._run(shared)
+                current = self.get_next_node(current, last_action)
+        finally:
+            _RUN_PARAMS.reset(token)
 
         return last_action
 
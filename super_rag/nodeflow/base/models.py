@@ -1,7 +1,6 @@
 
 
 from abc import ABC, abstractmethod
-from collections import deque
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -9,7 +8,7 @@ from super_rag.nodeflow.base.exceptions import CycleError
 from super_rag.utils.history import BaseChatMessageHistory
 
 
-@dataclass
+@dataclass(slots=True)
 class NodeInstance:
     """Instance of a node in the nodeflow"""
 
@@ -21,9 +20,18 @@ class NodeInstance:
     title: Optional[str] = None
     # 节点原始配置（与参考 JSON 的 data 对齐：start_page, model, prompt 等）
     data: Optional[Dict[str, Any]] = None
-
-
-@dataclass
+    # (path, kind, payload) for every input_values leaf that needs resolving, filled
+    # by compile_node_templates; None until compiled or after input_values change
+    _input_bindings: Optional[List[Tuple[Tuple[Any, ...], str, Any]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # NODE_RUNNER_REGISTRY entry for type, looked up once by the parser (or on first run)
+    _runner_info: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+    # Validated input model for nodes without bindings, reused across executions
+    _prevalidated_input: Any = field(default=None, init=False, repr=False, compare=False)
+
+
+@dataclass(slots=True)
 class Edge:
     """Connection between nodes in the nodeflow"""
 
@@ -36,7 +44,7 @@ class Edge:
     ui_properties: Optional[Dict[str, Any]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class NodeflowInstance:
     """Instance of a nodeflow with nodes and edges"""
 
@@ -50,40 +58,119 @@ class NodeflowInstance:
     tags: Optional[List[str]] = None
     input_schema: Optional[Dict[str, Any]] = None  # JSON Schema，工作流入参
     output_schema: Optional[Dict[str, Any]] = None  # JSON Schema，工作流出参
-
-    def validate(self) -> None:
-        """Validate the nodeflow configuration"""
-        self._topological_sort()
-
-    def _topological_sort(self) -> List[str]:
-        """Perform topological sort to detect cycles"""
-        # Build dependency graph
-        in_degree = {node_id: 0 for node_id in self.nodes}
+    # Graph indexes, built lazily and cached: edges grouped by source / target
+    # node id, successor / predecessor node ids, start/end nodes and the
+    # dependency levels used for execution
+    _adj: Optional[Dict[str, List[Edge]]] = field(default=None, init=False, repr=False, compare=False)
+    _rev_adj: Optional[Dict[str, List[Edge]]] = field(default=None, init=False, repr=False, compare=False)
+    _successors: Optional[Dict[str, List[str]]] = field(default=None, init=False, repr=False, compare=False)
+    _predecessors: Optional[Dict[str, List[str]]] = field(default=None, init=False, repr=False, compare=False)
+    _start_nodes: Optional[List[str]] = field(default=None, init=False, repr=False, compare=False)
+    _end_nodes: Optional[List[str]] = field(default=None, init=False, repr=False, compare=False)
+    _execution_levels: Optional[List[List[str]]] = field(default=None, init=False, repr=False, compare=False)
+    _dirty: bool = field(default=True, init=False, repr=False, compare=False)
+    _adj_edge_count: int = field(default=0, init=False, repr=False, compare=False)
+
+    def invalidate_adjacency(self) -> None:
+        """Mark the cached graph indexes stale after nodes or edges are modified"""
+        self._dirty = True
+
+    def _build_adjacency(self) -> None:
+        adj: Dict[str, List[Edge]] = {node_id: [] for node_id in self.nodes}
+        rev_adj: Dict[str, List[Edge]] = {node_id: [] for node_id in self.nodes}
+        successors: Dict[str, List[str]] = {node_id: [] for node_id in self.nodes}
+        predecessors: Dict[str, List[str]] = {node_id: [] for node_id in self.nodes}
         for edge in self.edges:
-            in_degree[edge.target] += 1
-
-        # Topological sort
-        queue = deque([node_id for node_id, degree in in_degree.items() if degree == 0])
-        if len(queue) == 0:
-            raise CycleError("nodeflow contains cycles")
-
-        sorted_nodes = []
+            source, target = edge.source, edge.target
+            adj[source].append(edge)
+            rev_adj[target].append(edge)
+            successors[source].append(target)
+            predecessors[target].append(source)
+        self._adj = adj
+        self._rev_adj = rev_adj
+        self._successors = successors
+        self._predecessors = predecessors
+        self._start_nodes = [node_id for node_id, sources in predecessors.items() if not sources]
+        self._end_nodes = [node_id for node_id, targets in successors.items() if not targets]
+        self._execution_levels = None
+        self._adj_edge_count = len(self.edges)
+        self._dirty = False
+
+    def _ensure_indexed(self) -> None:
+        # Appending/removing edges without invalidate_adjacency() is still caught
+        if self._dirty or self._adj_edge_count != len(self.edges):
+            self._build_adjacency()
+
+    @property
+    def adjacency(self) -> Dict[str, List[Edge]]:
+        """Outgoing edges per node id"""
+        self._ensure_indexed()
+        return self._adj
+
+    @property
+    def reverse_adjacency(self) -> Dict[str, List[Edge]]:
+        """Incoming edges per node id"""
+        self._ensure_indexed()
+        return self._rev_adj
+
+    @property
+    def successors(self) -> Dict[str, List[str]]:
+        """Target node ids per source node id, one entry per edge"""
+        self._ensure_indexed()
+        return self._successors
+
+    @property
+    def predecessors(self) -> Dict[str, List[str]]:
+        """Source node ids per target node id, one entry per edge"""
+        self._ensure_indexed()
+        return self._predecessors
+
+    @property
+    def start_nodes(self) -> List[str]:
+        """Node ids without incoming edges"""
+        self._ensure_indexed()
+        return self._start_nodes
+
+    @property
+    def end_nodes(self) -> List[str]:
+        """Node ids without outgoing edges"""
+        self._ensure_indexed()
+        return self._end_nodes
+
+    @property
+    def execution_levels(self) -> List[List[str]]:
+        """Node ids grouped into levels; a node only depends on nodes in earlier levels"""
+        self._ensure_indexed()
+        if self._execution_levels is None:
+            self._execution_levels = self._compute_execution_levels()
+        return self._execution_levels
 
-        while queue:
-            node_id = queue.popleft()
-            sorted_nodes.append(node_id)
-
-            # Update in-degree of successor nodes
-            for edge in self.edges:
-                if edge.source == node_id:
-                    in_degree[edge.target] -= 1
-                    if in_degree[edge.target] == 0:
-                        queue.append(edge.target)
-
-        if len(sorted_nodes) != len(self.nodes):
+    def validate(self) -> None:
+        """Validate the nodeflow configuration and index the graph for execution"""
+        self._build_adjacency()
+        self._execution_levels = self._compute_execution_levels()
+
+    def _compute_execution_levels(self) -> List[List[str]]:
+        """Kahn's algorithm emitting one level at a time; raises CycleError on cycles"""
+        successors = self._successors
+        in_degree = {node_id: len(sources) for node_id, sources in self._predecessors.items()}
+
+        levels = []
+        current_level = list(self._start_nodes)
+        while current_level:
+            levels.append(current_level)
+            next_level = []
+            for node_id in current_level:
+                for target in successors[node_id]:
+                    in_degree[target] -= 1
+                    if in_degree[target] == 0:
+                        next_level.append(target)
+            current_level = next_level
+
+        if sum(map(len, levels)) != len(self.nodes):
             raise CycleError("nodeflow contains cycles")
 
-        return sorted_nodes
+        return levels
 
 
 @dataclass
@@ -93,6 +180,10 @@ class ExecutionContext:
     outputs: Dict[str, Dict[str, Any]] = field(default_factory=dict)
     system_outputs: Dict[str, Any] = field(default_factory=dict)
     global_variables: Dict[str, Any] = field(default_factory=dict)
+    # Bumped whenever outputs or globals change, so derived render contexts can be reused
+    version: int = 0
+    # Bumped only when globals change (SystemInput is built from them)
+    globals_version: int = 0
 
     def get_input(self, node_id: str, field: str) -> Any:
         """Get input value for a node field"""
@@ -101,6 +192,7 @@ class ExecutionContext:
     def set_output(self, node_id: str, outputs: Dict[str, Any]) -> None:
         """Set output values for a node"""
         self.outputs[node_id] = outputs
+        self.version += 1
 
     def get_global(self, name: str) -> Any:
         """Get global variable value"""
@@ -109,6 +201,8 @@ class ExecutionContext:
     def set_global(self, name: str, value: Any) -> None:
         """Set global variable value"""
         self.global_variables[name] = value
+        self.version += 1
+        self.globals_version += 1
 
     def set_system_output(self, node_id: str, system_output: Any) -> None:
         """Set system output for a node"""
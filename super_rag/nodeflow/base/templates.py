@@ -0,0 +1,92 @@
+
+
+"""Parse-time compilation of node input templates."""
+
+from typing import Any, Dict, List, Tuple
+
+from jinja2 import Environment, StrictUndefined
+
+from super_rag.nodeflow.base.models import NodeInstance
+
+# Shared by the parser (compiling) and the engine (rendering, on-the-fly fallback).
+# Templates are compiled once at parse time (compile_node_templates) and kept on the
+# nodes; auto_reload/cache_size only matter should a loader ever be attached.
+# The environment is process-wide: do not mutate its globals/filters per flow.
+jinja_env = Environment(undefined=StrictUndefined, cache_size=1024, auto_reload=False, optimized=True)
+
+# Kinds of input bindings. Static leaves (no template syntax) get no binding at all.
+VAR_REF = "var_ref"  # pure "{{ path }}" reference, payload: (expr, parts)
+# pure reference into a node output / the globals, payload: (expr, scope, node_id, path)
+VAR_REF_FAST = "var_ref_fast"
+JINJA = "jinja"  # mixed template, payload: (compiled template or None, source)
+
+_TEMPLATE_MARKERS = ("{{", "{%", "{#")
+
+# Scopes of VAR_REF_FAST bindings
+SCOPE_NODE_OUTPUT = "node_output"
+SCOPE_GLOBAL = "global"
+
+
+def split_variable_reference(value: str) -> Tuple[str, List[str]] | None:
+    """Return (expr, parts) when value is a pure variable reference like "{{ nodes.x.output.y }}"."""
+    value_strip = value.strip()
+    if value_strip.startswith("{{") and value_strip.endswith("}}"):
+        expr = value_strip[2:-2].strip()
+        return expr, expr.split(".")
+    return None
+
+
+def _fast_variable_binding(expr: str, parts: List[str]) -> Tuple[str, str, str | None, Tuple[str, ...]] | None:
+    """
+    Pre-resolve the scope of "nodes.<id>.output.<path>" / "globals.<path>" references;
+    the engine resolves these exactly like its dynamic path, minus the per-run checks.
+    """
+    if parts[0] == "nodes" and len(parts) >= 4 and parts[2] == "output":
+        return expr, SCOPE_NODE_OUTPUT, parts[1], tuple(parts[3:])
+    if parts[0] in ("global", "globals") and len(parts) >= 2:
+        return expr, SCOPE_GLOBAL, None, tuple(parts[1:])
+    # Other shapes depend on runtime state (e.g. bare global names) or are invalid
+    return None
+
+
+def _is_static_text(value: str) -> bool:
+    # Jinja2 renders such strings unchanged, except that it drops one trailing newline
+    return not value.endswith("\n") and not any(marker in value for marker in _TEMPLATE_MARKERS)
+
+
+def compile_node_templates(node: NodeInstance) -> None:
+    """
+    Pre-scan node.input_values once and record a binding (path, kind, payload) for
+    every string leaf that needs resolving at execution time. Pure variable
+    references keep their pre-split path; other templates are compiled with Jinja2.
+    Strings that fail to compile get a None template and are reported by the engine
+    when the node runs.
+    """
+    bindings: List[Tuple[Tuple[Any, ...], str, Any]] = []
+    compiled: Dict[str, Any] = {}
+
+    def walk(value: Any, path: Tuple[Any, ...]) -> None:
+        if isinstance(value, dict):
+            for key, item in value.items():
+                walk(item, path + (key,))
+        elif isinstance(value, list):
+            for index, item in enumerate(value):
+                walk(item, path + (index,))
+        elif isinstance(value, str):
+            reference = split_variable_reference(value)
+            if reference is not None:
+                fast = _fast_variable_binding(*reference)
+                if fast is not None:
+                    bindings.append((path, VAR_REF_FAST, fast))
+                else:
+                    bindings.append((path, VAR_REF, reference))
+            elif not _is_static_text(value):
+                if value not in compiled:
+                    try:
+                        compiled[value] = jinja_env.from_string(value)
+                    except Exception:
+                        compiled[value] = None
+                bindings.append((path, JINJA, (compiled[value], value)))
+
+    walk(node.input_values, ())
+    node._input_bindings = bindings
@@ -3,20 +3,36 @@
 import asyncio
 import logging
 import time
-import uuid
-from collections import deque
-from typing import Any, AsyncGenerator, Dict, List, Optional, Set
+from secrets import token_hex
+from typing import Any, AsyncGenerator, Dict, Iterator, List, Mapping, Optional
 
-from jinja2 import Environment, StrictUndefined
+import orjson
 
-from super_rag.nodeflow.base.exceptions import CycleError, ValidationError
+from super_rag.nodeflow.base.exceptions import ValidationError
 from super_rag.nodeflow.base.models import NODE_RUNNER_REGISTRY, ExecutionContext, NodeflowInstance, NodeInstance, SystemInput
+from super_rag.nodeflow.base.templates import (
+    SCOPE_NODE_OUTPUT,
+    VAR_REF,
+    VAR_REF_FAST,
+    compile_node_templates,
+    jinja_env,
+    split_variable_reference,
+)
 import super_rag.nodeflow.runners
 from super_rag.utils.utils import utc_now
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Sentinel for single-lookup attribute / key resolution
+_MISSING = object()
+
+# Appended after nodeflow_end / nodeflow_error so get_events() can finish without cancellation
+_EVENT_SENTINEL = object()
+
+# Leading characters of array inputs that are parsed as JSON before falling back to comma split
+_JSON_ARRAY_STARTS = ("[", "{", '"')
+
 
 class nodeflowEvent:
     """Event emitted during nodeflow execution"""
@@ -50,32 +66,203 @@ class nodeflowEventType:
     nodeflow_END = "nodeflow_end"
     nodeflow_ERROR = "nodeflow_error"
 
-class NodeflowEngine:
-    """Engine for executing nodeflow instances"""
+def _to_string(value):
+    return str(value)
+
+
+def _to_integer(value):
+    try:
+        return int(value)
+    except Exception:
+        raise ValueError(f"Cannot convert '{value}' to integer")
+
+
+def _to_number(value):
+    try:
+        return float(value)
+    except Exception:
+        raise ValueError(f"Cannot convert '{value}' to float")
+
+
+def _to_boolean(value):
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        if value.lower() in ["true", "1", "yes"]:
+            return True
+        if value.lower() in ["false", "0", "no"]:
+            return False
+    if isinstance(value, int):
+        return bool(value)
+    raise ValueError(f"Cannot convert '{value}' to boolean")
+
+
+def _to_array(value):
+    if isinstance(value, list):
+        return value
+    if isinstance(value, str):
+        # Only strings that look like JSON are parsed; plain text goes straight to comma split
+        if value.lstrip()[:1] in _JSON_ARRAY_STARTS:
+            try:
+                arr = orjson.loads(value)
+            except orjson.JSONDecodeError as e:
+                raise ValidationError(f"Cannot convert '{value}' to array: {e}")
+            if isinstance(arr, list):
+                return arr
+        # Try comma split
+        return [v.strip() for v in value.split(",") if v.strip()]
+    raise ValueError(f"Cannot convert '{value}' to array")
+
+
+def _to_object(value):
+    if isinstance(value, dict):
+        return value
+    if isinstance(value, str) and value.lstrip()[:1] == "{":
+        try:
+            obj = orjson.loads(value)
+            if isinstance(obj, dict):
+                return obj
+        except orjson.JSONDecodeError:
+            pass
+    raise ValueError(f"Cannot convert '{value}' to object")
+
+
+def _keep_value(value):
+    return value
+
+
+# jsonschema "type" -> converter used by NodeflowEngine.convert_type_by_schema
+_SCHEMA_CONVERTERS = {
+    "string": _to_string,
+    "integer": _to_integer,
+    "number": _to_number,
+    "boolean": _to_boolean,
+    "array": _to_array,
+    "object": _to_object,
+}
+
 
-    def __init__(self, recorder: Optional[Any] = None):
+def _copy_containers(value):
+    """Copy nested dicts and lists; leaves (str, numbers, models, ...) are shared"""
+    if isinstance(value, dict):
+        return {k: _copy_containers(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy_containers(v) for v in value]
+    return value
+
+
+class _NodesCtxView(Mapping):
+    """Read-only view exposing node outputs as {"output": ...} without materializing the wrappers"""
+
+    __slots__ = ("_outputs",)
+
+    def __init__(self, outputs: Dict[str, Any]):
+        self._outputs = outputs
+
+    def __getitem__(self, node_id: str) -> Dict[str, Any]:
+        return {"output": self._outputs[node_id]}
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._outputs)
+
+    def __len__(self) -> int:
+        return len(self._outputs)
+
+
+class NodeflowEngine:
+    """Engine for executing nodeflow instances
+
+    Events are appended to a buffer that get_events() drains in batches, one wake-up
+    per batch rather than per event. Once event_queue_size events are pending,
+    emit_event waits for get_events() to catch up, so get_events() must be consumed
+    concurrently with execute_nodeflow(). With drop_on_full=True events are dropped
+    instead (counted in dropped_events), for fire-and-forget observability.
+    Until get_events() is called, events are not buffered at all.
+
+    max_concurrent_nodes caps how many nodes run at the same time (0 = unbounded).
+
+    scheduler="dag" starts each node as soon as all of its predecessors are done;
+    scheduler="level" runs the dependency levels one after another, each level
+    waiting for the slowest node of the previous one.
+    """
+
+    def __init__(
+        self,
+        recorder: Optional[Any] = None,
+        event_queue_size: int = 1024,
+        drop_on_full: bool = False,
+        max_concurrent_nodes: int = 0,
+        scheduler: str = "dag",
+    ):
+        if scheduler not in ("dag", "level"):
+            raise ValueError(f"Unknown scheduler: {scheduler}")
         self.context = ExecutionContext()
+        self.scheduler = scheduler
         self.execution_id = None
-        self._event_queue = asyncio.Queue()
-        self.jinja_env = Environment(undefined=StrictUndefined)
+        self._event_buffer: List[nodeflowEvent] = []
+        self._event_queue_size = event_queue_size
+        self._events_pending = asyncio.Event()
+        self._events_drained = asyncio.Event()
+        self._drop_on_full = drop_on_full
+        self.dropped_events = 0
+        self._has_event_consumer = False
+        self._node_semaphore = asyncio.Semaphore(max_concurrent_nodes) if max_concurrent_nodes > 0 else None
+        self.jinja_env = jinja_env
         self.recorder = recorder
+        # Jinja2 render context, rebuilt only when context.version changes
+        self._render_ctx: Optional[Dict[str, Any]] = None
+        self._render_ctx_version = -1
+        # SystemInput shared by all nodes until context.globals_version changes
+        self._sys_input: Optional[SystemInput] = None
+        self._sys_input_version = -1
 
     async def emit_event(self, event: nodeflowEvent):
         """Emit an event to all consumers"""
-        await self._event_queue.put(event)
+        if self._has_event_consumer:
+            if self._drop_on_full and len(self._event_buffer) >= self._event_queue_size:
+                self.dropped_events += 1
+            else:
+                while len(self._event_buffer) >= self._event_queue_size:
+                    self._events_drained.clear()
+                    await self._events_drained.wait()
+                self._event_buffer.append(event)
+                self._events_pending.set()
         # Also log the event
-        logger.info(
-            f"nodeflow event: {event.event_type} for {event.node_type} node {event.node_id}",
-            extra={"execution_id": self.execution_id},
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "nodeflow event: %s for %s node %s",
+                event.event_type,
+                event.node_type,
+                event.node_id,
+                extra={"execution_id": self.execution_id},
+            )
+
+    def _close_events(self) -> None:
+        """Signal end-of-stream to get_events(); never dropped, even when the buffer is full"""
+        if self._has_event_consumer:
+            self._event_buffer.append(_EVENT_SENTINEL)
+            self._events_pending.set()
 
-    async def get_events(self) -> AsyncGenerator[Dict[str, Any], None]:
-        """Get events as an async generator"""
+    def get_events(self) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Get events as an async generator; events are buffered from this call on.
+        The generator ends after the nodeflow_end / nodeflow_error event.
+        """
+        self._has_event_consumer = True
+        return self._iter_events()
+
+    async def _iter_events(self) -> AsyncGenerator[Dict[str, Any], None]:
         try:
             while True:
-                event = await self._event_queue.get()
-                yield event.to_dict()
-                self._event_queue.task_done()
+                await self._events_pending.wait()
+                self._events_pending.clear()
+                # Take everything emitted since the last wake-up in one go
+                batch, self._event_buffer = self._event_buffer, []
+                self._events_drained.set()
+                for event in batch:
+                    if event is _EVENT_SENTINEL:
+                        return
+                    yield event.to_dict()
         except asyncio.CancelledError:
             pass
 
@@ -90,7 +277,7 @@ class NodeflowEngine:
             Dictionary of final output values from the nodeflow execution
         """
         # Generate execution ID
-        self.execution_id = str(uuid.uuid4())[:8]  # Use first 8 characters of UUID
+        self.execution_id = token_hex(4)  # 8 hex characters
         logger.info(
             f"Starting nodeflow execution {self.execution_id} for nodeflow {nodeflow.name}",
             extra={"execution_id": self.execution_id},
@@ -115,12 +302,12 @@ class NodeflowEngine:
                 for var_name, var_value in initial_data.items():
                     self.context.set_global(var_name, var_value)
 
-            # Build dependency graph and perform topological sort
-            sorted_nodes = self._topological_sort(nodeflow)
-
-            # Execute nodes
-            for node_group in self._find_parallel_groups(nodeflow, sorted_nodes):
-                await self._execute_node_group(nodeflow, node_group)
+            if self.scheduler == "dag":
+                await self._run_dag(nodeflow)
+            else:
+                # Dependency levels are indexed on the nodeflow (cycles raise CycleError)
+                for node_group in nodeflow.execution_levels:
+                    await self._execute_node_group(nodeflow, node_group)
 
             # Emit nodeflow end event
             await self.emit_event(
@@ -132,6 +319,7 @@ class NodeflowEngine:
                     data={"nodeflow_name": nodeflow.name},
                 )
             )
+            self._close_events()
             if self.recorder:
                 await self.recorder.on_flow_end(self.context.outputs)
 
@@ -149,104 +337,66 @@ class NodeflowEngine:
                     data={"nodeflow_name": nodeflow.name, "error": str(e)},
                 )
             )
+            self._close_events()
             if self.recorder:
                 await self.recorder.on_flow_error(str(e))
             raise e
 
-    def _topological_sort(self, nodeflow: NodeflowInstance) -> List[str]:
-        """Perform topological sort to detect cycles
-
-        Args:
-            nodeflow: The nodeflow instance
-
-        Returns:
-            Topologically sorted list of node IDs
-
-        Raises:
-            CycleError: If the nodeflow contains cycles
-        """
-        # Build dependency graph from edges
-        in_degree = {node_id: 0 for node_id in nodeflow.nodes}
-        for edge in nodeflow.edges:
-            in_degree[edge.target] += 1
-
-        # Start with nodes that have no dependencies
-        queue = deque([node_id for node_id, degree in in_degree.items() if degree == 0])
-        if len(queue) == 0:
-            raise CycleError("nodeflow contains cycles")
-
-        sorted_nodes = []
-
-        while queue:
-            node_id = queue.popleft()
-            sorted_nodes.append(node_id)
-
-            # Update in-degree of successor nodes
-            for edge in nodeflow.edges:
-                if edge.source == node_id:
-                    in_degree[edge.target] -= 1
-                    if in_degree[edge.target] == 0:
-                        queue.append(edge.target)
-
-        if len(sorted_nodes) != len(nodeflow.nodes):
-            raise CycleError("nodeflow contains cycles")
-
-        return sorted_nodes
-
-    def _find_parallel_groups(self, nodeflow: NodeflowInstance, sorted_nodes: List[str]) -> List[Set[str]]:
-        """Find groups of nodes that can be executed in parallel (level by level)
-
-        Args:
-            nodeflow: The nodeflow instance
-            sorted_nodes: Topologically sorted list of node IDs
-
-        Returns:
-            List of node groups, where each group can be executed in parallel
-        """
-        # Build in-degree map
-        in_degree = {node_id: 0 for node_id in nodeflow.nodes}
-        for edge in nodeflow.edges:
-            in_degree[edge.target] += 1
-
-        # Track processed nodes
-        processed = set()
-        groups = []
-
-        while len(processed) < len(sorted_nodes):
-            # Find all nodes with in-degree 0 and not processed
-            current_group = set(
-                node_id for node_id in sorted_nodes if in_degree[node_id] == 0 and node_id not in processed
-            )
-            if not current_group:
-                break  # Should not happen if topological sort is correct
-            groups.append(current_group)
-            # Mark nodes as processed and update in-degree for successors
-            for node_id in current_group:
-                processed.add(node_id)
-                for edge in nodeflow.edges:
-                    if edge.source == node_id:
-                        in_degree[edge.target] -= 1
-        return groups
-
-    async def _execute_node_group(self, nodeflow: NodeflowInstance, node_group: Set[str]):
+    async def _execute_node_group(self, nodeflow: NodeflowInstance, node_group: List[str]):
         """Execute a group of nodes (possibly in parallel)"""
         logger.info(f"Executing node group: {node_group}", extra={"execution_id": self.execution_id})
         if len(node_group) == 1:
-            node_id = next(iter(node_group))
+            node_id = node_group[0]
             node = nodeflow.nodes[node_id]
             await self._execute_node(node)
         else:
-            tasks = []
-            for node_id in node_group:
-                node = nodeflow.nodes[node_id]
-                tasks.append(self._execute_node(node))
-            await asyncio.gather(*tasks)
+            execute = self._execute_node if self._node_semaphore is None else self._execute_node_bounded
+            try:
+                async with asyncio.TaskGroup() as tg:
+                    for node_id in node_group:
+                        tg.create_task(execute(nodeflow.nodes[node_id]))
+            except ExceptionGroup as eg:
+                # Surface the first node failure as-is, like the single-node path
+                raise eg.exceptions[0]
+
+    async def _run_dag(self, nodeflow: NodeflowInstance) -> None:
+        """Start every node once all of its predecessors have finished"""
+        # Computing the levels rejects cycles (CycleError) before any node is dispatched;
+        # they are cached after validate()
+        if not nodeflow.execution_levels:
+            return
+        successors = nodeflow.successors
+        remaining = {node_id: len(sources) for node_id, sources in nodeflow.predecessors.items()}
+        execute = self._execute_node if self._node_semaphore is None else self._execute_node_bounded
+        try:
+            async with asyncio.TaskGroup() as tg:
+                pending = {tg.create_task(execute(nodeflow.nodes[node_id])): node_id for node_id in nodeflow.start_nodes}
+                while pending:
+                    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        node_id = pending.pop(task)
+                        if task.cancelled() or task.exception() is not None:
+                            # The TaskGroup cancels the rest and re-raises
+                            continue
+                        for target in successors[node_id]:
+                            remaining[target] -= 1
+                            if remaining[target] == 0:
+                                pending[tg.create_task(execute(nodeflow.nodes[target]))] = target
+        except ExceptionGroup as eg:
+            # Surface the first node failure as-is, like the level scheduler
+            raise eg.exceptions[0]
+
+    async def _execute_node_bounded(self, node: NodeInstance) -> None:
+        async with self._node_semaphore:
+            await self._execute_node(node)
 
-    def _resolve_variable(self, expr: str, nodes_ctx: dict):
+    def _resolve_variable(self, expr: str, nodes_ctx: dict, parts: Optional[List[str]] = None):
         """
         Resolve variable path like 'nodes.start.output.query' or 'globals.query'.
+        parts may carry the pre-split path (see compile_node_templates).
         """
-        parts = expr.strip().split(".")
+        if parts is None:
+            parts = expr.strip().split(".")
         if not parts:
             return None
 
@@ -273,18 +423,21 @@ class NodeflowEngine:
 
     def _resolve_path_value(self, value: Any, field_path: List[str], expr: str):
         for key in field_path:
-            if isinstance(value, dict) and key in value:
-                value = value[key]
-            elif key == "output" and (not isinstance(value, dict) or key not in value):
-                # 单端口输出：无 "output" 键或非 dict 时，整段视为 output 端口值
-                if isinstance(value, dict):
-                    value = value
-                else:
-                    value = getattr(value, key, value)
-            elif isinstance(value, object) and hasattr(value, key):
-                value = getattr(value, key)
+            if isinstance(value, dict):
+                nxt = value.get(key, _MISSING)
+                if nxt is not _MISSING:
+                    value = nxt
+                elif key != "output":
+                    # 单端口输出：无 "output" 键时，整段视为 output 端口值
+                    raise ValidationError(f"Cannot resolve variable: ${{{{ {expr} }}}}")
+            elif key == "output":
+                # 单端口输出：非 dict 时，无 output 属性则整段视为 output 端口值
+                value = getattr(value, key, value)
             else:
-                raise ValidationError(f"Cannot resolve variable: ${{{{ {expr} }}}}")
+                nxt = getattr(value, key, _MISSING)
+                if nxt is _MISSING:
+                    raise ValidationError(f"Cannot resolve variable: ${{{{ {expr} }}}}")
+                value = nxt
         return value
 
     def resolve_expression(self, value, node_id=None, nodes_ctx=None):
@@ -295,139 +448,178 @@ class NodeflowEngine:
         3. Recursively handle dict/list.
         """
         if nodes_ctx is None:
-            nodes_ctx = {nid: {"output": outputs} for nid, outputs in self.context.outputs.items()}
-        globals_ctx = self.context.global_variables or {}
+            render_ctx = self._get_render_ctx()
+        else:
+            render_ctx = self._build_render_ctx(nodes_ctx)
+        return self._resolve(value, node_id, render_ctx)
+
+    def _resolve(self, value, node_id, render_ctx: Dict[str, Any]):
         if isinstance(value, dict):
-            return {k: self.resolve_expression(v, node_id, nodes_ctx) for k, v in value.items()}
+            return {k: self._resolve(v, node_id, render_ctx) for k, v in value.items()}
         if isinstance(value, list):
-            return [self.resolve_expression(v, node_id, nodes_ctx) for v in value]
+            return [self._resolve(v, node_id, render_ctx) for v in value]
         if not isinstance(value, str):
             return value
 
-        value_strip = value.strip()
         # Only handle variable reference like {{ ... }}
         # This is a workaround for the fact that the rendered output of jinja2 is a string, but we want to get the original value of the variable
-        if value_strip.startswith("{{") and value_strip.endswith("}}"):
-            expr = value_strip[2:-2].strip()
-            return self._resolve_variable(expr, nodes_ctx)
+        reference = split_variable_reference(value)
+        if reference is not None:
+            expr, parts = reference
+            return self._resolve_variable(expr, render_ctx["nodes"], parts)
 
         # Otherwise, use jinja2 template rendering
+        return self._render_template(None, value, node_id, render_ctx)
+
+    def _build_render_ctx(self, nodes_ctx: Mapping) -> Dict[str, Any]:
+        globals_ctx = self.context.global_variables or {}
+        render_ctx = {"nodes": nodes_ctx, "globals": globals_ctx}
+        for key, val in globals_ctx.items():
+            if key not in render_ctx:
+                render_ctx[key] = val
+        return render_ctx
+
+    def _get_render_ctx(self) -> Dict[str, Any]:
+        """Render context over the live execution context, shared until outputs/globals change"""
+        if self._render_ctx is None or self._render_ctx_version != self.context.version:
+            self._render_ctx = self._build_render_ctx(_NodesCtxView(self.context.outputs))
+            self._render_ctx_version = self.context.version
+        return self._render_ctx
+
+    def _render_template(self, template, source: str, node_id, render_ctx: Dict[str, Any]) -> str:
         try:
-            template = self.jinja_env.from_string(value)
-            render_ctx = {"nodes": nodes_ctx, "globals": globals_ctx}
-            for key, val in globals_ctx.items():
-                if key not in render_ctx:
-                    render_ctx[key] = val
+            if template is None:
+                template = self.jinja_env.from_string(source)
             rendered = template.render(**render_ctx)
         except Exception as e:
             raise ValidationError(f"Jinja2 render error in node '{node_id}': {e}")
         return rendered
 
+    def _resolve_bindings(self, node: NodeInstance) -> dict:
+        """
+        Resolve node.input_values using the bindings recorded by compile_node_templates.
+        Returns a fresh copy of every dict and list, static ones included, so runners
+        can't mutate node.input_values through their inputs.
+        """
+        if node._input_bindings is None:
+            compile_node_templates(node)
+        resolved = _copy_containers(node.input_values)
+        render_ctx = None
+        for path, kind, payload in node._input_bindings:
+            if kind == VAR_REF_FAST:
+                expr, scope, source_id, field_path = payload
+                if scope == SCOPE_NODE_OUTPUT:
+                    value = self._resolve_path_value(self.context.outputs.get(source_id, {}), field_path, expr)
+                else:
+                    value = self._resolve_path_value(self.context.global_variables, field_path, expr)
+            elif kind == VAR_REF:
+                expr, parts = payload
+                value = self._resolve_variable(expr, None, parts)
+            else:
+                if render_ctx is None:
+                    render_ctx = self._get_render_ctx()
+                template, source = payload
+                value = self._render_template(template, source, node.id, render_ctx)
+            container = resolved
+            for key in path[:-1]:
+                container = container[key]
+            container[path[-1]] = value
+        return resolved
+
     def convert_type_by_schema(self, value, field_schema):
         """Convert value to the type declared in field_schema (jsonschema property)."""
         if value is None:
             return None
-        typ = field_schema.get("type")
-        if typ == "string":
-            return str(value)
-        if typ == "integer":
-            try:
-                return int(value)
-            except Exception:
-                raise ValueError(f"Cannot convert '{value}' to integer")
-        if typ == "number":
-            try:
-                return float(value)
-            except Exception:
-                raise ValueError(f"Cannot convert '{value}' to float")
-        if typ == "boolean":
-            if isinstance(value, bool):
-                return value
-            if isinstance(value, str):
-                if value.lower() in ["true", "1", "yes"]:
-                    return True
-                if value.lower() in ["false", "0", "no"]:
-                    return False
-            if isinstance(value, int):
-                return bool(value)
-            raise ValueError(f"Cannot convert '{value}' to boolean")
-        if typ == "array":
-            if isinstance(value, list):
-                return value
-            if isinstance(value, str):
-                import json
-
-                try:
-                    arr = json.loads(value)
-                    if isinstance(arr, list):
-                        return arr
-                except Exception as e:
-                    raise ValidationError(f"Cannot convert '{value}' to array: {e}")
-                # Try comma split
-                return [v.strip() for v in value.split(",") if v.strip()]
-            raise ValueError(f"Cannot convert '{value}' to array")
-        if typ == "object":
-            if isinstance(value, dict):
-                return value
-            if isinstance(value, str):
-                import json
-
-                try:
-                    obj = json.loads(value)
-                    if isinstance(obj, dict):
-                        return obj
-                except Exception:
-                    pass
-            raise ValueError(f"Cannot convert '{value}' to object")
-        return value
+        return _SCHEMA_CONVERTERS.get(field_schema.get("type"), _keep_value)(value)
 
     def _bind_node_inputs(self, node: NodeInstance, runner_info: dict) -> tuple:
         """
         Bind input variables for a node using Pydantic model from runner_info.
         Returns (user_input, sys_input)
         """
-        raw_inputs = getattr(node, "input_values", {})
-        resolved_inputs = self.resolve_expression(raw_inputs, node.id)
-        resolved_inputs = self._apply_global_overrides(resolved_inputs)
+        if node._input_bindings is None:
+            compile_node_templates(node)
         input_model = runner_info["input_model"]
+        if not node._input_bindings and not self._has_global_overrides(node.input_values):
+            # Static inputs: validate once, then hand each execution its own deep copy
+            # so a runner mutating its input can't leak into the next run
+            prevalidated = node._prevalidated_input
+            if prevalidated is None:
+                prevalidated = self._validate_inputs(node, input_model, dict(node.input_values))
+                node._prevalidated_input = prevalidated
+            user_input = prevalidated.model_copy(deep=True)
+        else:
+            resolved_inputs = self._resolve_bindings(node)
+            resolved_inputs = self._apply_global_overrides(resolved_inputs)
+            user_input = self._validate_inputs(node, input_model, resolved_inputs)
+        if self._sys_input is None or self._sys_input_version != self.context.globals_version:
+            self._sys_input = SystemInput(**self.context.global_variables)
+            self._sys_input_version = self.context.globals_version
+        return user_input, self._sys_input
+
+    @staticmethod
+    def _validate_inputs(node: NodeInstance, input_model, inputs: dict):
         try:
-            user_input = input_model.model_validate(resolved_inputs)
+            return input_model.model_validate(inputs)
         except Exception as e:
             raise ValidationError(f"Input validation error for node {node.id}: {e}")
-        sys_input = SystemInput(**self.context.global_variables)
-        return user_input, sys_input
+
+    def _has_global_overrides(self, inputs: dict) -> bool:
+        """Whether _apply_global_overrides would replace any of inputs"""
+        global_variables = self.context.global_variables
+        if not global_variables:
+            return False
+        return any(global_variables.get(key) for key in inputs)
 
     def _apply_global_overrides(self, resolved_inputs: dict) -> dict:
-        if not self.context.global_variables:
+        global_variables = self.context.global_variables
+        if not global_variables:
             return resolved_inputs
-        for key, value in self.context.global_variables.items():
-            if key in resolved_inputs and value:
-                resolved_inputs[key] = value
+        # Walk whichever side is smaller; only existing keys are reassigned
+        if len(global_variables) <= len(resolved_inputs):
+            for key, value in global_variables.items():
+                if value and key in resolved_inputs:
+                    resolved_inputs[key] = value
+        else:
+            for key in resolved_inputs:
+                value = global_variables.get(key)
+                if value:
+                    resolved_inputs[key] = value
         return resolved_inputs
 
     async def _execute_node(self, node: NodeInstance) -> None:
         """
         Execute a single node using the provided context, using runner_info from registry.
         """
-        runner_info = NODE_RUNNER_REGISTRY.get(node.type)
-        logger.info(f"runner info:{runner_info}")
-        if not runner_info:
-            raise ValidationError(f"Unknown node type: {node.type}")
+        runner_info = node._runner_info
+        if runner_info is None:
+            # Nodes built outside nodeflowParser
+            runner_info = NODE_RUNNER_REGISTRY.get(node.type)
+            if not runner_info:
+                raise ValidationError(f"Unknown node type: {node.type}")
+            node._runner_info = runner_info
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("runner info: %s", runner_info)
         runner = runner_info["runner"]
         start_time = time.perf_counter()
         try:
             user_input, sys_input = self._bind_node_inputs(node, runner_info)
+            # Dump inputs once, and only when an event consumer or recorder will see them
+            if self._has_event_consumer or self.recorder:
+                inputs = user_input.model_dump()
+            else:
+                inputs = None
             await self.emit_event(
                 nodeflowEvent(
                     nodeflowEventType.NODE_START,
                     node.id,
                     node.type,
                     self.execution_id,
-                    {"node_type": node.type, "inputs": user_input.model_dump()},
+                    {"node_type": node.type, "inputs": inputs},
                 )
             )
             if self.recorder:
-                await self.recorder.on_node_start(node.id, node.type, user_input.model_dump())
+                await self.recorder.on_node_start(node.id, node.type, inputs)
             outputs = await runner.run(user_input, sys_input)
             if isinstance(outputs, tuple) and len(outputs) == 2:
                 output_data, system_output = outputs
@@ -465,22 +657,18 @@ class NodeflowEngine:
 
     def update_node_input(self, nodeflow: NodeflowInstance, node_id: str, value: Any):
         """Update the input values for a node"""
-        nodeflow.nodes[node_id].input_values.update(value)
+        node = nodeflow.nodes[node_id]
+        node.input_values.update(value)
+        node._input_bindings = None  # recompiled on next bind
+        node._prevalidated_input = None
 
     def find_start_nodes(self, nodeflow: NodeflowInstance) -> str:
         """Find all start nodes (nodes with in-degree == 0) in the nodeflow"""
-        in_degree = {node_id: 0 for node_id in nodeflow.nodes}
-        for edge in nodeflow.edges:
-            in_degree[edge.target] += 1
-        start_nodes = [node_id for node_id in nodeflow.nodes if in_degree[node_id] == 0]
+        start_nodes = nodeflow.start_nodes
         if len(start_nodes) != 1:
             raise ValidationError("nodeflow must have exactly one start node")
         return start_nodes[0]
 
     def find_end_nodes(self, nodeflow: NodeflowInstance) -> List[str]:
         """Find all output nodes (nodes with in-degree > 0 and out-degree 0) in the nodeflow"""
-        out_degree = {node_id: 0 for node_id in nodeflow.nodes}
-        for edge in nodeflow.edges:
-            out_degree[edge.source] += 1
-        output_nodes = [node_id for node_id in nodeflow.nodes if out_degree[node_id] == 0]
-        return output_nodes
+        return list(nodeflow.end_nodes)
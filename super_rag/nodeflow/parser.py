@@ -1,9 +1,11 @@
 """解析工作流配置：仅支持 graph + input_schema 格式（如 rag_flow3.json / new_flow_structure.json）。"""
 
-from typing import Any, Dict, List, Optional, Set
+from functools import lru_cache
+from types import UnionType
+from typing import Annotated, Any, Dict, List, Optional, Set, Union, get_args, get_origin
 
-import json
 import jsonref
+import orjson
 import yaml
 
 from super_rag.nodeflow.base.models import (
@@ -13,6 +15,9 @@ from super_rag.nodeflow.base.models import (
     NodeInstance,
 )
 
+from super_rag.nodeflow.base.templates import compile_node_templates
+import super_rag.nodeflow.runners  # noqa: F401  注册内置节点类型
+
 from .base.exceptions import ValidationError
 
 
@@ -23,6 +28,195 @@ _DATA_INPUT_KEYS = frozenset({
     "model_name", "prompt_template", "similarity_threshold", "collection_ids",
 })
 
+# 边 / input_schema 生成的变量引用："{{ nodes.<id>.output.<handle> }}"、"{{ globals.<key> }}"；
+# 固定片段拼接比 f-string 格式化更快
+_NODE_REF_PREFIX = "{{ nodes."
+_NODE_REF_OUTPUT = ".output."
+_GLOBAL_REF_PREFIX = "{{ globals."
+_REF_SUFFIX = " }}"
+
+# libyaml 加速的 SafeLoader，未编译 libyaml 时退回纯 Python 实现
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _load_text(raw: str | bytes) -> Any:
+    """JSON 优先（orjson，str/bytes 均可），失败再按 YAML 解析"""
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        try:
+            return yaml.load(raw, Loader=_YAML_LOADER)
+        except yaml.YAMLError as e:
+            raise ValidationError(f"Invalid JSON/YAML format: {e}") from e
+
+
+@lru_cache(maxsize=None)
+def _model_schema_properties(model) -> Optional[Dict[str, Any]]:
+    """model_json_schema() 的 properties，每个模型类只生成一次"""
+    try:
+        schema = model.model_json_schema()
+    except Exception:
+        return None
+    return schema.get("properties") or {}
+
+
+# Python 注解 -> JSON Schema type，与 pydantic 生成的 schema 保持一致
+_ANNOTATION_TYPES = {
+    str: "string",
+    int: "integer",
+    float: "number",
+    bool: "boolean",
+    list: "array",
+    tuple: "array",
+    set: "array",
+    frozenset: "array",
+    dict: "object",
+    type(None): "null",
+}
+
+
+def _annotation_types(annotation) -> Optional[Set[str]]:
+    """把字段注解映射为 JSON Schema 类型集合；无法确定时返回 None（改走 model_json_schema）"""
+    if annotation is Any:
+        return set()
+    typ = _ANNOTATION_TYPES.get(annotation)
+    if typ is not None:
+        return {typ}
+    origin = get_origin(annotation)
+    if origin is Annotated:
+        return _annotation_types(get_args(annotation)[0])
+    if origin is Union or origin is UnionType:
+        result: Set[str] = set()
+        for arg in get_args(annotation):
+            arg_types = _annotation_types(arg)
+            if arg_types is None:
+                return None
+            result |= arg_types
+        return result
+    if origin in (list, tuple, set, frozenset, dict):
+        return {_ANNOTATION_TYPES[origin]}
+    return None
+
+
+def _field_types(model, handle: str) -> Optional[Set[str]]:
+    """直接读 pydantic v2 的 model_fields 注解，不生成整份 JSON Schema"""
+    fields = getattr(model, "model_fields", None)
+    if not isinstance(fields, dict):
+        return None
+    field_info = fields.get(handle)
+    # 未知字段或带别名（schema 里以别名为键）时交给 schema 路径
+    if field_info is None or (field_info.alias is not None and field_info.alias != handle):
+        return None
+    return _annotation_types(field_info.annotation)
+
+
+@lru_cache(maxsize=None)
+def _handle_types(model, handle: str) -> frozenset:
+    """模型字段（端口）的 JSON Schema 类型集合，按 (模型, 端口) 缓存"""
+    field_types = _field_types(model, handle)
+    if field_types is None:
+        schema = nodeflowParser._get_model_field_schema(model, handle)
+        field_types = nodeflowParser._extract_schema_types(schema)
+    return frozenset(field_types)
+
+
+def _has_ref(data: Any) -> bool:
+    """非递归扫描是否存在 {"$ref": "..."}，遇到第一个即返回；无引用时跳过 _inline_refs"""
+    stack = [data]
+    pop, push = stack.pop, stack.extend
+    while stack:
+        obj = pop()
+        if isinstance(obj, dict):
+            if isinstance(obj.get("$ref"), str):
+                return True
+            push(v for v in obj.values() if isinstance(v, (dict, list)))
+        elif isinstance(obj, list):
+            push(v for v in obj if isinstance(v, (dict, list)))
+    return False
+
+
+class _ExternalRef(Exception):
+    """配置中出现非本文档（非 "#..."）的 $ref，交给 jsonref 处理"""
+
+
+def _inline_refs(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    一次遍历把本文档内的 {"$ref": "#/a/b"} 替换为指向的值（JSON Pointer），
+    返回普通 dict/list，后续访问不再经过 jsonref 代理。
+    未包含 $ref 的子树原样复用，不做拷贝；同一个 $ref 只解析一次，结果共享。
+    """
+    resolved: Dict[str, Any] = {}
+    resolving: Set[str] = set()
+
+    def resolve_ref(ref: str) -> Any:
+        if not ref.startswith("#"):
+            raise _ExternalRef(ref)
+        if ref in resolved:
+            return resolved[ref]
+        if ref in resolving:
+            raise ValidationError(f"Circular $ref: {ref}")
+        target: Any = data
+        pointer = ref[1:]
+        if pointer:
+            if not pointer.startswith("/"):
+                raise ValidationError(f"Invalid $ref: {ref}")
+            for token in pointer[1:].split("/"):
+                token = token.replace("~1", "/").replace("~0", "~")
+                try:
+                    target = target[int(token)] if isinstance(target, list) else target[token]
+                except (KeyError, IndexError, ValueError, TypeError):
+                    raise ValidationError(f"Unresolvable $ref: {ref}")
+        resolving.add(ref)
+        value = walk(target)
+        resolving.discard(ref)
+        resolved[ref] = value
+        return value
+
+    def walk(obj: Any) -> Any:
+        if isinstance(obj, dict):
+            ref = obj.get("$ref")
+            if isinstance(ref, str):
+                return resolve_ref(ref)
+            out = None
+            for key, value in obj.items():
+                new_value = walk(value)
+                if new_value is not value:
+                    if out is None:
+                        out = dict(obj)
+                    out[key] = new_value
+            return obj if out is None else out
+        if isinstance(obj, list):
+            out = None
+            for i, value in enumerate(obj):
+                new_value = walk(value)
+                if new_value is not value:
+                    if out is None:
+                        out = list(obj)
+                    out[i] = new_value
+            return obj if out is None else out
+        return obj
+
+    try:
+        return walk(data)
+    except _ExternalRef:
+        return jsonref.replace_refs(data, proxies=False)
+
+
+@lru_cache(maxsize=64)
+def _load_text_cached(raw: str | bytes) -> Any:
+    """按原始文本缓存 解析 + 引用展开 的结果；返回的数据各调用方共享，只读"""
+    data = _load_text(raw)
+    # 原文里没有 "$ref" 时整份文档都不含引用，跳过引用解析的遍历
+    if isinstance(data, dict) and ("$ref" if isinstance(raw, str) else b"$ref") in raw:
+        data = _inline_refs(data)
+    return data
+
+
+def _parse_text(raw: str | bytes) -> NodeflowInstance:
+    # 执行引擎会在节点上写状态（_input_bindings、_prevalidated_input、input_values），
+    # 所以只缓存数据，每次调用都构建新的 NodeflowInstance
+    return nodeflowParser._parse_data(_load_text_cached(raw), resolve_refs=False)
+
 
 class nodeflowParser:
     """Parser for nodeflow configuration. Only supports graph format (graph.nodes / graph.edges)."""
@@ -31,15 +225,16 @@ class nodeflowParser:
     def parse(data: str | dict[str, Any]) -> NodeflowInstance:
         """Parse YAML/JSON into a NodeflowInstance. Only accepts workflow with top-level "graph"
         (graph.nodes, graph.edges, optional input_schema/output_schema). See rag_flow3.json.
+
+        Loading and $ref resolution of text input are cached by content; every call still
+        returns a new NodeflowInstance.
         """
         if isinstance(data, str):
-            try:
-                data = json.loads(data)
-            except json.JSONDecodeError:
-                try:
-                    data = yaml.safe_load(data)
-                except yaml.YAMLError as e:
-                    raise ValidationError(f"Invalid JSON/YAML format: {e}") from e
+            return _parse_text(data)
+        return nodeflowParser._parse_data(data)
+
+    @staticmethod
+    def _parse_data(data: Any, resolve_refs: bool = True) -> NodeflowInstance:
         if not isinstance(data, dict):
             raise ValidationError("nodeflow data must be a dict")
 
@@ -49,7 +244,9 @@ class nodeflowParser:
                 "Use format like rag_flow3.json / new_flow_structure.json."
             )
 
-        data = jsonref.replace_refs(data)
+        # 文本输入在 _load_text_cached 中已展开引用；dict 输入先做一次廉价扫描
+        if resolve_refs and _has_ref(data):
+            data = _inline_refs(data)
         return nodeflowParser._parse_graph_format(data)
 
     @staticmethod
@@ -59,48 +256,66 @@ class nodeflowParser:
         nodes_list: List[Dict[str, Any]] = graph.get("nodes") or []
         edges_list: List[Dict[str, Any]] = graph.get("edges") or []
 
-        # 1) 先建节点（仅 id/type/data），input_values 稍后由边 + data 填充
+        input_schema = data.get("input_schema") or {}
+        props = input_schema.get("properties") or {}
+
+        # 循环内频繁用到的全局名 / 方法先绑定为局部变量
+        parse_node = nodeflowParser._parse_node_from_graph
+        parse_edge = nodeflowParser._parse_edge_from_graph
+        data_input_keys = _DATA_INPUT_KEYS
+        node_ref_prefix, node_ref_output, ref_suffix = _NODE_REF_PREFIX, _NODE_REF_OUTPUT, _REF_SUFFIX
+
+        # 1) 先建节点（仅 id/type/data），input_values 稍后由边 + data 填充；
+        # 同时记下 data.name 命中 input_schema 属性的输入节点（同名取第一个），供第 4 步使用
         nodes: Dict[str, NodeInstance] = {}
+        input_nodes: Dict[str, NodeInstance] = {}
         for nd in nodes_list:
-            node = nodeflowParser._parse_node_from_graph(nd)
+            node = parse_node(nd)
             nodes[node.id] = node
+            if props:
+                name = node.data.get("name")
+                if name in props and name not in input_nodes:
+                    input_nodes[name] = node
 
-        # 2) 解析边（含 sourceHandle/targetHandle）
+        # 2) 解析边（含 sourceHandle/targetHandle），并直接填充目标节点的 input_values：
+        # targetHandle <- nodes.source.output.sourceHandle
+        # sourceHandle 须与上游节点实际输出键一致（如 start 输出为 query，用 sourceHandle: "query"）
+        # 同一输出端口扇出到多条边时，引用字符串只格式化一次
         edges: List[Edge] = []
+        refs: Dict[tuple, str] = {}
+        get_node = nodes.get
         for ed in edges_list:
-            edges.append(nodeflowParser._parse_edge_from_graph(ed))
-
-        # 3) 按边填充目标节点的 input_values：targetHandle <- nodes.source.output.sourceHandle
-        # sourceHandle 须与上游节点实际输出键一致（如 start 输出为 query，用 sourceHandle: "query"）
-        for edge in edges:
-            target_id = edge.target
-            target_handle = edge.target_handle or "value"
-            source_id = edge.source
-            source_handle = edge.source_handle or "output"
-            if target_id not in nodes:
+            edge = parse_edge(ed)
+            edges.append(edge)
+            target = get_node(edge.target)
+            if target is None:
                 continue
-            ref = f"{{{{ nodes.{source_id}.output.{source_handle} }}}}"
-            nodes[target_id].input_values[target_handle] = ref
+            source_handle = edge.source_handle or "output"
+            key = (edge.source, source_handle)
+            ref = refs.get(key)
+            if ref is None:
+                ref = refs[key] = node_ref_prefix + edge.source + node_ref_output + source_handle + ref_suffix
+            target.input_values[edge.target_handle or "value"] = ref
 
-        # 4) 用 node.data 中的常见输入键补默认值（未被边覆盖的）
+        # 3) 用 node.data 中的常见输入键补默认值（未被边覆盖的）
         for node in nodes.values():
             if not node.data:
                 continue
-            for k, v in node.data.items():
-                if k in _DATA_INPUT_KEYS and k not in node.input_values and v is not None:
+            # 先与白名单求交集（C 层完成），只遍历相关键
+            for k in data_input_keys.intersection(node.data):
+                v = node.data[k]
+                if v is not None and k not in node.input_values:
                     node.input_values[k] = v
 
-        # 5) 工作流 input_schema 映射到输入节点：data.name == schema key -> 端口用 globals.key
-        input_schema = data.get("input_schema") or {}
-        props = input_schema.get("properties") or {}
-        for schema_key in props:
-            ref = f"{{{{ globals.{schema_key} }}}}"
-            for node in nodes.values():
-                if not node.data or node.data.get("name") != schema_key:
-                    continue
-                node.input_values[schema_key] = ref
-                node.input_values["value"] = ref  # 兼容单端口输入节点（如 StringInput 的 value）
-                break
+        # 4) 工作流 input_schema 映射到输入节点：data.name == schema key -> 端口用 globals.key
+        for schema_key, node in input_nodes.items():
+            ref = _GLOBAL_REF_PREFIX + schema_key + _REF_SUFFIX
+            node.input_values[schema_key] = ref
+            node.input_values["value"] = ref  # 兼容单端口输入节点（如 StringInput 的 value）
+
+        # 5) input_values 已确定：预编译模板，执行时只需渲染
+        for node in nodes.values():
+            compile_node_templates(node)
 
         nodeflow = NodeflowInstance(
             name=data.get("name", "Unnamed nodeflow"),
@@ -122,62 +337,69 @@ class nodeflowParser:
         """Graph-format node: id, type, data (flat config)."""
         data = node_data.get("data") or {}
         title = data.get("name") or node_data.get("id", "")
-        return NodeInstance(
+        node_type = node_data["type"]
+        # 解析时即确定 runner：未知类型直接报错，执行时不再查注册表
+        runner_info = NODE_RUNNER_REGISTRY.get(node_type)
+        if not runner_info:
+            raise ValidationError(f"Unknown node type: {node_type}")
+        node = NodeInstance(
             id=node_data["id"],
-            type=node_data["type"],
+            type=node_type,
             input_schema={},
             input_values={},
             output_schema={},
             title=title,
             data=data,
         )
+        node._runner_info = runner_info
+        return node
 
     @staticmethod
     def _parse_edge_from_graph(edge_data: Dict[str, Any]) -> Edge:
         """Graph-format edge: source, sourceHandle, target, targetHandle, id, ui_properties."""
+        # Edge 是 slots dataclass：原始 dict 只在这里读一次，之后各步都是属性读取
+        get = edge_data.get
         return Edge(
-            source=edge_data["source"],
-            target=edge_data["target"],
-            source_handle=edge_data.get("sourceHandle"),
-            target_handle=edge_data.get("targetHandle"),
-            edge_id=edge_data.get("id"),
-            ui_properties=edge_data.get("ui_properties"),
+            edge_data["source"],
+            edge_data["target"],
+            get("sourceHandle"),
+            get("targetHandle"),
+            get("id"),
+            get("ui_properties"),
         )
 
     @staticmethod
     def _get_model_field_schema(model, field_name: str) -> Optional[dict[str, Any]]:
-        try:
-            schema = model.model_json_schema()
-        except Exception:
+        properties = _model_schema_properties(model)
+        if properties is None:
             return None
-        properties = schema.get("properties") or {}
         return properties.get(field_name)
 
     @staticmethod
     def _extract_schema_types(schema: Optional[dict[str, Any]]) -> Set[str]:
-        if not schema:
-            return set()
-        if "anyOf" in schema:
-            types: Set[str] = set()
-            for item in schema.get("anyOf") or []:
-                types.update(nodeflowParser._extract_schema_types(item))
-            return types
-        if "oneOf" in schema:
-            types = set()
-            for item in schema.get("oneOf") or []:
-                types.update(nodeflowParser._extract_schema_types(item))
-            return types
-        if "allOf" in schema:
-            types = set()
-            for item in schema.get("allOf") or []:
-                types.update(nodeflowParser._extract_schema_types(item))
-            return types
-        typ = schema.get("type")
-        if isinstance(typ, list):
-            return set(typ)
-        if isinstance(typ, str):
-            return {typ}
-        return set()
+        # 显式栈代替递归，只维护一个结果集合；anyOf > oneOf > allOf > type，同层只取其一
+        types: Set[str] = set()
+        stack = [schema]
+        while stack:
+            item = stack.pop()
+            if not item:
+                continue
+            if "anyOf" in item:
+                stack.extend(item.get("anyOf") or [])
+            elif "oneOf" in item:
+                stack.extend(item.get("oneOf") or [])
+            elif "allOf" in item:
+                stack.extend(item.get("allOf") or [])
+            else:
+                typ = item.get("type")
+                if isinstance(typ, list):
+                    types.update(typ)
+                elif isinstance(typ, str):
+                    types.add(typ)
+                if "any" in types:
+                    # "any" 与任何类型兼容，其余类型已无意义
+                    return types
+        return types
 
     @staticmethod
     def _types_compatible(source_types: Set[str], target_types: Set[str]) -> bool:
@@ -193,33 +415,28 @@ class nodeflowParser:
 
     @staticmethod
     def _validate_edge_types(nodeflow: NodeflowInstance) -> None:
+        get_node = nodeflow.nodes.get
+        types_compatible = nodeflowParser._types_compatible
+        handle_types = _handle_types
         for edge in nodeflow.edges:
-            source_node = nodeflow.nodes.get(edge.source)
-            target_node = nodeflow.nodes.get(edge.target)
-            if not source_node or not target_node:
-                continue
-            source_runner = NODE_RUNNER_REGISTRY.get(source_node.type)
-            target_runner = NODE_RUNNER_REGISTRY.get(target_node.type)
-            if not source_runner or not target_runner:
-                continue
-
+            # 未声明端口的边无需类型检查，先于节点/注册项查找判断
             source_handle = edge.source_handle
             target_handle = edge.target_handle
             if not source_handle or not target_handle:
                 continue
 
-            source_schema = nodeflowParser._get_model_field_schema(
-                source_runner.get("output_model"),
-                source_handle,
-            )
-            target_schema = nodeflowParser._get_model_field_schema(
-                target_runner.get("input_model"),
-                target_handle,
-            )
+            source_node = get_node(edge.source)
+            target_node = get_node(edge.target)
+            if not source_node or not target_node:
+                continue
+            source_runner = source_node._runner_info
+            target_runner = target_node._runner_info
+            if not source_runner or not target_runner:
+                continue
 
-            source_types = nodeflowParser._extract_schema_types(source_schema)
-            target_types = nodeflowParser._extract_schema_types(target_schema)
-            if not nodeflowParser._types_compatible(source_types, target_types):
+            source_types = handle_types(source_runner.get("output_model"), source_handle)
+            target_types = handle_types(target_runner.get("input_model"), target_handle)
+            if not types_compatible(source_types, target_types):
                 raise ValidationError(
                     f"Edge type mismatch: {edge.source}.{source_handle} ({sorted(source_types)}) "
                     f"-> {edge.target}.{target_handle} ({sorted(target_types)})"
@@ -227,15 +444,12 @@ class nodeflowParser:
 
     @staticmethod
     def load_from_file(file_path: str) -> NodeflowInstance:
-        """Load nodeflow configuration from a file (YAML or JSON)."""
+        """Load nodeflow configuration from a file (YAML or JSON); loading is cached by file content."""
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
+            # 直接把字节交给 orjson / yaml，省去一次 UTF-8 解码
+            with open(file_path, "rb") as f:
                 raw = f.read()
-            if file_path.lower().endswith(".json"):
-                data = json.loads(raw)
-            else:
-                data = yaml.safe_load(raw)
-            return nodeflowParser.parse(data)
+            return _parse_text(raw)
         except FileNotFoundError:
             raise ValidationError(f"nodeflow configuration file not found: {file_path}")
         except Exception as e:
@@ -7,8 +7,9 @@ Nodeflow 节点注册表：加载外部 node pack（entry point），并提供
 
 import json
 import logging
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Set
 
 from importlib.metadata import entry_points
 
@@ -29,8 +30,9 @@ BUILTIN_NODE_METADATA: Dict[str, Dict[str, str]] = {
 }
 
 
+@lru_cache(maxsize=512)
 def _model_json_schema(model: Any) -> Dict[str, Any]:
-    """从 Pydantic 模型生成 JSON Schema，兼容 Pydantic v1/v2。"""
+    """从 Pydantic 模型生成 JSON Schema，兼容 Pydantic v1/v2。按模型类缓存，返回值勿修改。"""
     try:
         if hasattr(model, "model_json_schema"):
             return model.model_json_schema()
@@ -41,37 +43,61 @@ def _model_json_schema(model: Any) -> Dict[str, Any]:
     return {}
 
 
-def load_nodeflow_packs() -> None:
+# entry point 扫描只做一次；已加载的 pack 名称，rescan 时跳过
+_packs_loaded = False
+_loaded_pack_names: Set[str] = set()
+
+
+def load_nodeflow_packs(rescan: bool = False) -> None:
     """
     加载所有通过 entry point 注册的 node pack。
     在应用启动时调用一次，之后 NODE_RUNNER_REGISTRY 中会包含内置 + 外部节点。
+    再次调用直接返回；rescan=True 时重新扫描 entry point，只加载新出现的 pack。
     """
+    global _packs_loaded
+    if _packs_loaded and not rescan:
+        return
     try:
         eps = entry_points(group=ENTRY_POINT_GROUP)
     except Exception as e:
         logger.debug("No entry points for %s: %s", ENTRY_POINT_GROUP, e)
         return
+    _packs_loaded = True
     for ep in eps:
+        if ep.name in _loaded_pack_names:
+            continue
         try:
             fn: Callable[[], None] = ep.load()
             fn()
+            _loaded_pack_names.add(ep.name)
             logger.info("Loaded nodeflow pack: %s", ep.name)
         except Exception as e:
             logger.warning("Failed to load nodeflow pack %s: %s", ep.name, e, exc_info=True)
 
 
+# get_registered_node_types() 的结果，注册表内容（类型 -> 注册项）不变时直接复用
+_node_types_cache_key: Optional[tuple] = None
+_node_types_cache: List[Dict[str, Any]] = []
+
+
 def get_registered_node_types() -> List[Dict[str, Any]]:
     """
     返回当前已注册的节点类型列表，用于画布节点面板与 API。
     包含 type、label、category、input_schema、output_schema。
+    注册表未变化时返回缓存的同一列表，调用方勿修改。
     """
+    global _node_types_cache_key, _node_types_cache
     load_nodeflow_packs()
+    cache_key = tuple((node_type, id(info)) for node_type, info in NODE_RUNNER_REGISTRY.items())
+    if cache_key == _node_types_cache_key:
+        return _node_types_cache
     result: List[Dict[str, Any]] = []
+    get_meta = BUILTIN_NODE_METADATA.get
     for node_type, info in NODE_RUNNER_REGISTRY.items():
         runner = info.get("runner")
         input_model = info.get("input_model")
         output_model = info.get("output_model")
-        meta = BUILTIN_NODE_METADATA.get(node_type, {"label": node_type, "category": "Other"})
+        meta = get_meta(node_type, {"label": node_type, "category": "Other"})
         result.append({
             "type": node_type,
             "label": meta.get("label", node_type),
@@ -80,6 +106,7 @@ def get_registered_node_types() -> List[Dict[str, Any]]:
             "output_schema": _model_json_schema(output_model) if output_model else {},
             "description": getattr(runner, "__doc__", None) or "",
         })
+    _node_types_cache_key, _node_types_cache = cache_key, result
     return result
 
 
@@ -1,8 +1,11 @@
 
 
+import asyncio
 import logging
+from functools import lru_cache
 from typing import List, Optional, Tuple
 
+import orjson
 from pydantic import BaseModel, Field
 
 from super_rag.db.models import Collection
@@ -25,6 +28,40 @@ class GraphSearchOutput(BaseModel):
     docs: List[DocumentWithScore]
 
 
+# Graphiti helpers: graphiti (neo4j driver, LLM clients) is only loaded once a graph
+# search actually runs; later searches reuse the helpers without re-running the imports
+_graphiti_helpers = None
+
+
+def _get_graphiti_helpers():
+    global _graphiti_helpers
+    if _graphiti_helpers is None:
+        from super_rag.graphiti.graphiti_manager import _create_graphiti_instance
+        from super_rag.graphiti.graphiti_core.search.search_config_recipes import COMBINED_HYBRID_SEARCH_RRF
+        from super_rag.graphiti.graphiti_core.search.search_helpers import search_results_to_context_string
+
+        _graphiti_helpers = (_create_graphiti_instance, COMBINED_HYBRID_SEARCH_RRF, search_results_to_context_string)
+    return _graphiti_helpers
+
+
+@lru_cache(maxsize=256)
+def _knowledge_graph_enabled(config: str) -> bool:
+    """
+    Read enable_knowledge_graph straight from the raw config JSON, cached on the config
+    string so edited configs are re-read. Only unusual values (non-bool flags, invalid
+    JSON) go through the full parseCollectionConfig for its coercion and errors.
+    """
+    try:
+        config_dict = orjson.loads(config)
+    except (orjson.JSONDecodeError, TypeError):
+        config_dict = None
+    if isinstance(config_dict, dict):
+        flag = config_dict.get("enable_knowledge_graph")
+        if flag is None or isinstance(flag, bool):
+            return bool(flag)
+    return bool(parseCollectionConfig(config).enable_knowledge_graph)
+
+
 # Database operations interface
 class GraphSearchRepository:
     """Repository interface for graph search database operations"""
@@ -33,6 +70,12 @@ class GraphSearchRepository:
         """Get collection by ID for the user"""
         return await async_db_ops.query_collection(user, collection_id)
 
+    async def get_collections(self, user, collection_ids: List[str]) -> List[Collection]:
+        """Get collections by IDs for the user in one query, in the order of collection_ids"""
+        collections = await async_db_ops.query_collections_by_ids(user, collection_ids)
+        order = {collection_id: i for i, collection_id in enumerate(collection_ids)}
+        return sorted(collections, key=lambda collection: order[collection.id])
+
 
 # Business logic service
 class GraphSearchService:
@@ -45,22 +88,36 @@ class GraphSearchService:
         self, user, query: str, top_k: int, collection_ids: List[str]
     ) -> List[DocumentWithScore]:
         """Execute graph search with given parameters"""
-        collection = None
-        if collection_ids:
-            collection = await self.repository.get_collection(user, collection_ids[0])
-
-        if not collection:
+        if not collection_ids:
             return []
-
-        config = parseCollectionConfig(collection.config)
-        if not config.enable_knowledge_graph:
-            logger.warning(f"Collection {collection.id} does not have knowledge graph enabled")
+        if len(collection_ids) == 1:
+            collection = await self.repository.get_collection(user, collection_ids[0])
+            collections = [collection] if collection else []
+        else:
+            # One query for all collections, then search them concurrently
+            collections = await self.repository.get_collections(user, collection_ids)
+
+        enabled = []
+        for collection in collections:
+            if not _knowledge_graph_enabled(collection.config):
+                logger.warning(f"Collection {collection.id} does not have knowledge graph enabled")
+                continue
+            enabled.append(collection)
+
+        if not enabled:
             return []
-
+        if len(enabled) == 1:
+            return await self._search_collection(enabled[0], query, top_k)
+        results = await asyncio.gather(*(self._search_collection(c, query, top_k) for c in enabled))
+        # Merge best-first across collections so the node still returns at most top_k docs
+        merged = [doc for docs in results for doc in docs]
+        merged.sort(key=lambda doc: doc.score if doc.score is not None else 0.0, reverse=True)
+        return merged[:top_k]
+
+    async def _search_collection(self, collection: Collection, query: str, top_k: int) -> List[DocumentWithScore]:
+        """Graph search over a single knowledge-graph enabled collection"""
         # Use Graphiti for graph search (same backend as graph indexing)
-        from super_rag.graphiti.graphiti_manager import _create_graphiti_instance
-        from super_rag.graphiti.graphiti_core.search.search_config_recipes import COMBINED_HYBRID_SEARCH_RRF
-        from super_rag.graphiti.graphiti_core.search.search_helpers import search_results_to_context_string
+        _create_graphiti_instance, COMBINED_HYBRID_SEARCH_RRF, search_results_to_context_string = _get_graphiti_helpers()
 
         graphiti = _create_graphiti_instance(collection)
         try:
@@ -1,9 +1,12 @@
 
 
+import asyncio
 import base64
 import json
 import logging
+import time
 import uuid
+from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
 
 from litellm import BaseModel
@@ -35,6 +38,16 @@ FALLBACK_MAX_CONTEXT_LENGTH = 50000
 # Max images to feed to LLM
 MAX_IMAGES_PER_QUERY = 5
 
+# Max concurrent object store reads when loading images
+IMAGE_FETCH_CONCURRENCY = 8
+
+# Model configs and provider base URLs change rarely; cache them for this many
+# seconds so every LLM node run doesn't repeat the same DB lookups
+MODEL_CONFIG_CACHE_TTL = 60.0
+
+_model_caps_cache: Dict[Tuple[str, str], Tuple[float, "ModelCaps"]] = {}
+_provider_base_url_cache: Dict[str, Tuple[float, str]] = {}
+
 
 async def add_human_message(history: BaseChatMessageHistory, message, message_id):
     if not message_id:
@@ -68,10 +81,65 @@ class LLMOutput(BaseModel):
     text: str
 
 
-async def calculate_model_token_limits(
+@dataclass(frozen=True, slots=True)
+class ModelCaps:
+    """Token limits and capabilities of a completion model"""
+
+    context_window: Optional[int] = None
+    max_input_tokens: Optional[int] = None
+    max_output_tokens: Optional[int] = None
+    vision: bool = False
+
+
+async def load_model_caps(
     model_service_provider: str,
     model_name: str,
-) -> Tuple[int, int]:
+) -> ModelCaps:
+    """Load the model configuration with a single DB query, cached for MODEL_CONFIG_CACHE_TTL seconds"""
+    key = (model_service_provider, model_name)
+    now = time.monotonic()
+    cached = _model_caps_cache.get(key)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    try:
+        model_config = await async_db_ops.query_llm_provider_model(
+            provider_name=model_service_provider, api=APIType.COMPLETION.value, model=model_name
+        )
+    except Exception:
+        # Not cached, so a transient DB error doesn't stick
+        return ModelCaps()
+
+    if model_config:
+        caps = ModelCaps(
+            context_window=model_config.context_window,
+            max_input_tokens=model_config.max_input_tokens,
+            max_output_tokens=model_config.max_output_tokens,
+            vision=model_config.has_tag("vision"),
+        )
+    else:
+        caps = ModelCaps()
+    _model_caps_cache[key] = (now + MODEL_CONFIG_CACHE_TTL, caps)
+    return caps
+
+
+async def get_provider_base_url(model_service_provider: str) -> str:
+    """Base URL of the LLM provider, cached for MODEL_CONFIG_CACHE_TTL seconds"""
+    now = time.monotonic()
+    cached = _provider_base_url_cache.get(model_service_provider)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    try:
+        llm_provider = await async_db_ops.query_llm_provider_by_name(model_service_provider)
+        base_url = llm_provider.base_url
+    except Exception:
+        raise Exception(f"LLMProvider {model_service_provider} not found")
+    _provider_base_url_cache[model_service_provider] = (now + MODEL_CONFIG_CACHE_TTL, base_url)
+    return base_url
+
+
+def model_token_limits(caps: ModelCaps) -> Tuple[int, int]:
     """
     Calculate input and output token limits based on three constraints:
 
@@ -80,29 +148,14 @@ async def calculate_model_token_limits(
     3. Total (input + output) should not exceed context_window
 
     Args:
-        model_service_provider: Model service provider name
-        model_name: Model name
+        caps: Model configuration from load_model_caps
 
     Returns:
         Tuple of (max_input_tokens, final_output_tokens)
     """
-    # Get model configuration to determine token limits
-    try:
-        model_config = await async_db_ops.query_llm_provider_model(
-            provider_name=model_service_provider, api=APIType.COMPLETION.value, model=model_name
-        )
-        if model_config:
-            context_window = model_config.context_window
-            max_input_tokens = model_config.max_input_tokens
-            max_output_tokens = model_config.max_output_tokens
-        else:
-            context_window = None
-            max_input_tokens = None
-            max_output_tokens = None
-    except Exception:
-        context_window = None
-        max_input_tokens = None
-        max_output_tokens = None
+    context_window = caps.context_window
+    max_input_tokens = caps.max_input_tokens
+    max_output_tokens = caps.max_output_tokens
 
     # Constraint 1: Determine output token reservation
     reserved_output_tokens = min(max_output_tokens or DEFAULT_OUTPUT_TOKENS, DEFAULT_OUTPUT_TOKENS)
@@ -132,19 +185,30 @@ async def calculate_model_token_limits(
     return max_allowed_input, reserved_output_tokens
 
 
+async def calculate_model_token_limits(
+    model_service_provider: str,
+    model_name: str,
+) -> Tuple[int, int]:
+    """
+    Calculate input and output token limits for a model, see model_token_limits
+
+    Args:
+        model_service_provider: Model service provider name
+        model_name: Model name
+
+    Returns:
+        Tuple of (max_input_tokens, final_output_tokens)
+    """
+    caps = await load_model_caps(model_service_provider, model_name)
+    return model_token_limits(caps)
+
+
 async def is_vision_model(
     model_service_provider: str,
     model_name: str,
 ) -> bool:
-    try:
-        model_config = await async_db_ops.query_llm_provider_model(
-            provider_name=model_service_provider, api=APIType.COMPLETION.value, model=model_name
-        )
-        if model_config:
-            return model_config.has_tag("vision")
-        return False
-    except Exception:
-        return False
+    caps = await load_model_caps(model_service_provider, model_name)
+    return caps.vision
 
 
 # Database operations interface
@@ -161,6 +225,95 @@ class LLMService:
     def __init__(self, repository: LLMRepository):
         self.repository = repository
 
+    async def _load_images(self, user, image_docs: List[DocumentWithScore], limit: int) -> List[Tuple[str, Reference]]:
+        """
+        Fetch the image assets of image_docs concurrently, at most limit of them.
+
+        Returns (data URI, reference) pairs in image_docs order. Each round only
+        fetches as many docs as are still needed; docs whose asset is missing or
+        fails to load are skipped and replaced by the following ones.
+        """
+        candidates = []
+        for doc_with_score in image_docs:
+            asset_id = doc_with_score.metadata.get("asset_id", None)
+            mime_type = doc_with_score.metadata.get("mimetype", None)
+            coll_id = doc_with_score.metadata.get("collection_id", None)
+            doc_id = doc_with_score.metadata.get("document_id", None)
+            if asset_id and mime_type and coll_id and doc_id:
+                candidates.append((doc_with_score, asset_id, mime_type, (coll_id, doc_id)))
+        if not candidates:
+            return []
+
+        object_store = get_async_object_store()
+        semaphore = asyncio.Semaphore(IMAGE_FETCH_CONCURRENCY)
+        # (collection_id, document_id) -> object store base path, None if the lookup failed
+        base_path_cache: Dict[Tuple[str, str], Optional[str]] = {}
+
+        async def load(doc_with_score, asset_id, mime_type, base_path):
+            asset_path = f"{base_path}/assets/{asset_id}"
+            try:
+                async with semaphore:
+                    image_stream_tuple = await object_store.get(asset_path)
+                    if not image_stream_tuple:
+                        logger.warning(f"Image not found in object store at path: {asset_path}")
+                        return None
+
+                    image_stream, _ = image_stream_tuple
+                    image_bytes = bytearray()
+                    async for chunk in image_stream:
+                        image_bytes += chunk
+            except Exception as e:
+                logger.error(f"Failed to process image asset {asset_id}: {e}", exc_info=True)
+                return None
+
+            encoded_string = base64.b64encode(image_bytes).decode("utf-8")
+            image_uri = f"data:{mime_type};base64,{encoded_string}"
+            ref_obj = Reference(
+                text=doc_with_score.text,
+                image_uri=image_uri,
+                metadata=doc_with_score.metadata,
+                score=doc_with_score.score,
+            )
+            return image_uri, ref_obj
+
+        loaded: List[Tuple[str, Reference]] = []
+        next_index = 0
+        while next_index < len(candidates) and len(loaded) < limit:
+            batch = candidates[next_index : next_index + limit - len(loaded)]
+            next_index += len(batch)
+
+            # One document query per distinct (collection_id, document_id) not looked up yet
+            doc_keys = [key for key in dict.fromkeys(candidate[3] for candidate in batch) if key not in base_path_cache]
+            documents = await asyncio.gather(
+                *(
+                    async_db_ops.query_document(user=user, collection_id=coll_id, document_id=doc_id)
+                    for coll_id, doc_id in doc_keys
+                ),
+                return_exceptions=True,
+            )
+            for (coll_id, doc_id), doc in zip(doc_keys, documents):
+                base_path = None
+                if isinstance(doc, BaseException):
+                    logger.error(
+                        f"Failed to query document collection_id={coll_id}, document_id={doc_id}: {doc}",
+                        exc_info=doc,
+                    )
+                elif not doc:
+                    logger.warning(f"Document not found for collection_id={coll_id}, document_id={doc_id}")
+                else:
+                    base_path = doc.object_store_base_path()
+                base_path_cache[(coll_id, doc_id)] = base_path
+
+            results = await asyncio.gather(
+                *(
+                    load(doc_with_score, asset_id, mime_type, base_path_cache[doc_key])
+                    for doc_with_score, asset_id, mime_type, doc_key in batch
+                    if base_path_cache[doc_key]
+                )
+            )
+            loaded.extend(result for result in results if result is not None)
+        return loaded
+
     async def generate_response(
         self,
         user,
@@ -175,29 +328,32 @@ class LLMService:
         docs: Optional[List[DocumentWithScore]] = None,
     ) -> Tuple[str, Dict]:
         """Generate LLM response with given parameters"""
-        api_key = await async_db_ops.query_provider_api_key(model_service_provider, user)
+        # The lookups are independent: run them concurrently, then report failures
+        # in the original order (api key first, then provider)
+        api_key, base_url, caps = await asyncio.gather(
+            async_db_ops.query_provider_api_key(model_service_provider, user),
+            get_provider_base_url(model_service_provider),
+            load_model_caps(model_service_provider, model_name),
+            return_exceptions=True,
+        )
+        if isinstance(api_key, BaseException):
+            raise api_key
         if not api_key:
             raise InvalidConfigurationError(
                 "api_key", None, f"API KEY not found for LLM Provider: {model_service_provider}"
             )
+        if isinstance(base_url, BaseException):
+            raise base_url
+        if isinstance(caps, BaseException):
+            raise caps
 
-        try:
-            llm_provider = await async_db_ops.query_llm_provider_by_name(model_service_provider)
-            base_url = llm_provider.base_url
-        except Exception:
-            raise Exception(f"LLMProvider {model_service_provider} not found")
-
-        # Calculate input and output limits based on model configuration
-        max_input_tokens, max_output_tokens = await calculate_model_token_limits(
-            model_service_provider=model_service_provider,
-            model_name=model_name,
-        )
-
-        vision_model = await is_vision_model(model_service_provider, model_name)
+        # Token limits and vision support come from the same model config row
+        max_input_tokens, max_output_tokens = model_token_limits(caps)
+        vision_model = caps.vision
 
         # Build context and references from documents
         max_input_chars = max_input_tokens * TOKEN_TO_CHAR_RATIO
-        context = ""
+        context_parts: List[str] = []
         references: List[Reference] = []
         image_docs: List[DocumentWithScore] = []
         if docs:
@@ -210,27 +366,31 @@ class LLMService:
                         # If the index_method is "vision_to_text", the doc is also contains text content,
                         # which is useful if the current LLM doesn't support image input.
                         if not vision_model and doc.text and doc.text.strip():
-                            metadata = ""
-                            if doc.metadata.get("source"):
-                                metadata += "Source: " + doc.metadata["source"] + "\n"
-                            if doc.metadata.get("page_idx") is not None:
-                                metadata += "Page: " + str(int(doc.metadata["page_idx"]) + 1) + "\n"
+                            source = doc.metadata.get("source")
+                            page_idx = doc.metadata.get("page_idx")
+                            source_line = f"Source: {source}\n" if source else ""
+                            page_line = f"Page: {int(page_idx) + 1}\n" if page_idx is not None else ""
+                            metadata = f"{source_line}{page_line}"
 
                             doc.text = f"\n------ IMAGE DESCRIPTION BEGIN ------ \n{metadata}Description:\n{doc.text}\n------ IMAGE DESCRIPTION END ------\n"
                             text_docs.append(doc)
                 else:
                     text_docs.append(doc)
 
+            # Estimate final prompt length: template + query + current context + new doc,
+            # keeping a running context length and joining the pieces once at the end
+            base_len = len(prompt_template) + len(query)
+            context_len = 0
             for doc in text_docs:
-                # Estimate final prompt length: template + query + current context + new doc
-                estimated_prompt_length = len(prompt_template) + len(query) + len(context) + len(doc.text)
-                if estimated_prompt_length > max_input_chars:
+                doc_len = len(doc.text)
+                if base_len + context_len + doc_len > max_input_chars:
                     break
-                context += doc.text
+                context_parts.append(doc.text)
+                context_len += doc_len
                 ref_obj = Reference(text=doc.text, metadata=doc.metadata, score=doc.score)
                 references.append(ref_obj)
 
-        prompt = prompt_template.format(query=query, context=context)
+        prompt = prompt_template.format(query=query, context="".join(context_parts))
         if len(prompt) > max_input_chars:
             raise Exception(
                 f"Prompt requires {len(prompt)} characters, which exceeds the calculated "
@@ -239,51 +399,10 @@ class LLMService:
 
         images = []
         if vision_model and image_docs:
-            base_path_cache: Dict[Tuple[str, str], str] = {}
-            object_store = get_async_object_store()
-            for doc_with_score in image_docs:
-                asset_id = doc_with_score.metadata.get("asset_id", None)
-                mime_type = doc_with_score.metadata.get("mimetype", None)
-                coll_id = doc_with_score.metadata.get("collection_id", None)
-                doc_id = doc_with_score.metadata.get("document_id", None)
-                if not (asset_id and mime_type and coll_id and doc_id):
-                    continue
-
-                try:
-                    cache_key = (coll_id, doc_id)
-                    if cache_key in base_path_cache:
-                        base_path = base_path_cache[cache_key]
-                    else:
-                        doc = await async_db_ops.query_document(user=user, collection_id=coll_id, document_id=doc_id)
-                        if not doc:
-                            logger.warning(f"Document not found for collection_id={coll_id}, document_id={doc_id}")
-                            continue
-                        base_path = doc.object_store_base_path()
-                        base_path_cache[cache_key] = base_path
-
-                    asset_path = f"{base_path}/assets/{asset_id}"
-                    image_stream_tuple = await object_store.get(asset_path)
-                    if not image_stream_tuple:
-                        logger.warning(f"Image not found in object store at path: {asset_path}")
-                        continue
-
-                    image_stream, _ = image_stream_tuple
-                    image_bytes = b"".join([chunk async for chunk in image_stream])
-                    encoded_string = base64.b64encode(image_bytes).decode("utf-8")
-                    image_uri = f"data:{mime_type};base64,{encoded_string}"
-                    images.append(image_uri)
-                    ref_obj = Reference(
-                        text=doc_with_score.text,
-                        image_uri=image_uri,
-                        metadata=doc_with_score.metadata,
-                        score=doc_with_score.score,
-                    )
-                    references.append(ref_obj)
-
-                    if len(images) > MAX_IMAGES_PER_QUERY:
-                        break
-                except Exception as e:
-                    logger.error(f"Failed to process image asset {asset_id}: {e}", exc_info=True)
+            # Matches the former serial loop, which stopped once it had gone past MAX_IMAGES_PER_QUERY
+            for image_uri, ref_obj in await self._load_images(user, image_docs, MAX_IMAGES_PER_QUERY + 1):
+                images.append(image_uri)
+                references.append(ref_obj)
 
         cs = CompletionService(
             custom_llm_provider, model_name, base_url, api_key, temperature, max_output_tokens, vision=vision_model
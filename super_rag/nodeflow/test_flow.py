@@ -2,7 +2,7 @@
 import os
 
 from super_rag.nodeflow.engine import NodeflowEngine
-from super_rag.nodeflow.parser import nodeflowParser
+from super_rag.nodeflow.parser import _load_text, nodeflowParser
 import asyncio
 import json
 
@@ -13,11 +13,9 @@ async def test_rag_flow():
     current_dir = os.path.dirname(os.path.abspath(__file__))
     yaml_path = os.path.join(current_dir, "examples", "rag_flow3.json")
 
-    import yaml
-
-    # Load YAML as dict for inspection
-    with open(yaml_path, 'r', encoding='utf-8') as f:
-        yaml_dict = yaml.safe_load(f)
+    # Load YAML as dict for inspection (same orjson / libyaml loader as the parser)
+    with open(yaml_path, 'rb') as f:
+        yaml_dict = _load_text(f.read())
     print("YAML loaded as dict:")
     print(json.dumps(yaml_dict))
 
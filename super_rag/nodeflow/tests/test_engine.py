@@ -0,0 +1,31 @@
+
+import asyncio
+
+import pytest
+
+from super_rag.nodeflow.base.exceptions import CycleError
+from super_rag.nodeflow.base.models import Edge, NodeflowInstance, NodeInstance
+from super_rag.nodeflow.engine import NodeflowEngine
+
+
+@pytest.mark.parametrize("scheduler", ["dag", "level"])
+def test_cyclic_flow_fails_before_running_any_node(scheduler):
+    """A flow that was never validate()d must not run its acyclic prefix before the cycle is found"""
+    nodeflow = NodeflowInstance(
+        name="cyclic",
+        title="cyclic",
+        nodes={node_id: NodeInstance(id=node_id, type="start") for node_id in ("start", "a", "b")},
+        edges=[Edge(source="start", target="a"), Edge(source="a", target="b"), Edge(source="b", target="a")],
+    )
+    engine = NodeflowEngine(scheduler=scheduler)
+    executed = []
+
+    async def fake_execute(node):
+        executed.append(node.id)
+
+    engine._execute_node = fake_execute
+
+    with pytest.raises(CycleError):
+        asyncio.run(engine.execute_nodeflow(nodeflow))
+
+    assert executed == []
@@ -0,0 +1,61 @@
+
+import asyncio
+from collections import Counter
+
+from super_rag.nodeflow.base.flow_runtime import AsyncFlow, AsyncNode, AsyncParallelBatchFlow
+
+
+class FlakyNode(AsyncNode):
+    """Fails every attempt after yielding, so parallel runs interleave their retries"""
+
+    def __init__(self, attempts: Counter, retries_seen: list):
+        super().__init__(max_retries=2)
+        self.attempts = attempts
+        self.retries_seen = retries_seen
+
+    async def prep_async(self, shared):
+        return self.params["name"]
+
+    async def exec_async(self, name):
+        self.attempts[name] += 1
+        self.retries_seen.append((name, self.cur_retry))
+        await asyncio.sleep(0)
+        raise RuntimeError(name)
+
+    async def exec_fallback_async(self, name, exc):
+        return f"fallback-{name}"
+
+    async def post_async(self, shared, name, exec_res):
+        shared[name] = exec_res
+        return "default"
+
+
+class Batch(AsyncParallelBatchFlow):
+    async def prep_async(self, shared):
+        return [{"name": "a"}, {"name": "b"}]
+
+
+def test_parallel_batch_runs_retry_independently():
+    """Each concurrent run gets its full retry budget and sees its own attempt index"""
+    attempts: Counter = Counter()
+    retries_seen: list = []
+    flow = Batch(start=FlakyNode(attempts, retries_seen))
+    shared = {}
+
+    asyncio.run(flow.run_async(shared))
+
+    assert attempts == {"a": 2, "b": 2}
+    assert sorted(retries_seen) == [("a", 0), ("a", 1), ("b", 0), ("b", 1)]
+    assert shared == {"a": "fallback-a", "b": "fallback-b"}
+
+
+def test_single_flow_retries_until_fallback():
+    attempts: Counter = Counter()
+    flow = AsyncFlow(start=FlakyNode(attempts, []))
+    flow.set_params({"name": "solo"})
+    shared = {}
+
+    asyncio.run(flow.run_async(shared))
+
+    assert attempts == {"solo": 2}
+    assert shared == {"solo": "fallback-solo"}
@@ -0,0 +1,27 @@
+
+import json
+
+from super_rag.nodeflow.parser import nodeflowParser
+
+FLOW_TEXT = json.dumps(
+    {
+        "name": "cached",
+        "input_schema": {"properties": {"query": {"type": "string"}}},
+        "graph": {"nodes": [{"id": "start", "type": "start", "data": {"name": "query"}}], "edges": []},
+    }
+)
+
+
+def test_parsing_the_same_text_returns_independent_instances():
+    """Engine state written onto one parsed flow must not leak into the next parse of the same text"""
+    first = nodeflowParser.parse(FLOW_TEXT)
+    first_start = first.nodes["start"]
+    first_start.input_values["query"] = "changed"
+    first_start._prevalidated_input = object()
+
+    second = nodeflowParser.parse(FLOW_TEXT)
+
+    assert second is not first
+    assert second.nodes["start"] is not first_start
+    assert second.nodes["start"].input_values["query"] == "{{ globals.query }}"
+    assert second.nodes["start"]._prevalidated_input is None
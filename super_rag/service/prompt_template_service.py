@@ -338,9 +338,9 @@ def list_prompt_templates(language: str) -> view_models.PromptTemplateList:
     for template in templates:
         response.append(
             view_models.PromptTemplate(
-                name=template["name"],
-                prompt=template["prompt"],
-                description=template["description"],
+                name=template.name,
+                prompt=template.prompt,
+                description=template.description,
             )
         )
     return view_models.PromptTemplateList(items=response)